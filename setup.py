@@ -44,5 +44,11 @@ setup(
     install_requires=requirements,
     extras_require={
         "spanner": spanner_requirements,
+        # Aho-Corasick matching for large ambiguity keyword sets
+        "ahocorasick": ["pyahocorasick>=2.0.0"],
+        # Faster BigQuery downloads for the Wikidata loader
+        "bqstorage": ["google-cloud-bigquery-storage", "pyarrow"],
+        # Faster JSON encoding of Wikidata loader columns
+        "orjson": ["orjson>=3.9"],
     },
 )
@@ -21,7 +21,7 @@ sys.path.insert(0, str(SCRIPT_DIR))
 
 from textql_mcp.main_spanner import create_mcp_server_with_spanner  # noqa: E402
 from textql_mcp.core.server import run_server  # noqa: E402
-from textql_mcp.utils.ambiguity_detector import SimpleAmbiguityDetector  # noqa: E402
+from textql_mcp.utils.ambiguity_detector import default_simple_detector  # noqa: E402
 
 # Set up logging
 logging.basicConfig(
@@ -45,7 +45,7 @@ def load_config(config_path: str = None) -> dict:
 
     logger.debug(f"Loading configuration from: {config_path}")
     with open(config_path, "r") as f:
-        return yaml.safe_load(f)
+        return yaml.safe_load(f.read())
 
 
 def main():
@@ -119,7 +119,7 @@ def main():
         server = create_mcp_server_with_spanner(
             instance_id=gcp_config["spanner"]["instance_id"],
             database_id=gcp_config["spanner"]["database_id"],
-            ambiguity_detector=SimpleAmbiguityDetector(),
+            ambiguity_detector=default_simple_detector(),
             server_name=server_config["mcp"]["name"],
             spanner_project_id=gcp_config["project_id"],
             graph_name="wikidata_graph",
@@ -0,0 +1,192 @@
+"""
+Tests for the ambiguity detector implementations.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from textql_mcp.utils.ambiguity_detector import (
+    CallbackAmbiguityDetector,
+    RegexAmbiguityDetector,
+    SimpleAmbiguityDetector,
+    default_simple_detector,
+)
+
+
+def test_simple_detector_keywords():
+    """Test that keywords are matched regardless of case."""
+    detector = SimpleAmbiguityDetector()
+
+    assert detector.is_ambiguous("WHICH employees work in sales")
+    assert detector.is_ambiguous("Could You list the departments")
+    assert not detector.is_ambiguous("list employees in sales")
+
+
+def test_simple_detector_short_queries():
+    """Test that queries with fewer than three words are ambiguous."""
+    detector = SimpleAmbiguityDetector(["zzz"])
+
+    assert detector.is_ambiguous("employees")
+    assert detector.is_ambiguous("  list   employees ")
+    assert not detector.is_ambiguous("list employees\tnow")
+
+
+def test_simple_detector_custom_keywords():
+    """Test a detector built with custom keywords."""
+    detector = SimpleAmbiguityDetector(["maybe", "a.b"])
+
+    assert detector.is_ambiguous("show me maybe the employees")
+    assert detector.is_ambiguous("show me a.b employees")
+    assert not detector.is_ambiguous("show me axb employees")
+
+
+def test_simple_detector_non_ascii():
+    """Test keyword matching for non-ASCII queries and keywords."""
+    assert SimpleAmbiguityDetector().is_ambiguous("Which café serves espresso")
+    detector = SimpleAmbiguityDetector(["qué"])
+
+    assert detector._keyword_bytes is None
+    assert detector.is_ambiguous("dime QUÉ empleados hay")
+    assert not detector.is_ambiguous("dime los empleados hay")
+
+
+def test_simple_detector_large_keyword_set():
+    """Test keyword matching for sets above the Aho-Corasick threshold."""
+    keywords = [f"term{i}" for i in range(100)] + ["how many"]
+    detector = SimpleAmbiguityDetector(keywords)
+
+    assert detector._keyword_bytes is None
+    assert detector.is_ambiguous("show TERM42 for each employee")
+    assert detector.is_ambiguous("How Many employees are there")
+    assert not detector.is_ambiguous("show the term for each employee")
+
+
+def test_simple_detector_uses_automaton_when_available():
+    """Test that pyahocorasick backs large keyword sets when installed."""
+    pytest.importorskip("ahocorasick")
+    detector = SimpleAmbiguityDetector([f"term{i}" for i in range(100)])
+
+    assert detector._automaton is not None
+    assert detector.is_ambiguous("show TERM42 for each employee")
+
+
+def test_regex_detector_default_patterns():
+    """Test the default patterns of the RegexAmbiguityDetector."""
+    detector = RegexAmbiguityDetector()
+
+    assert detector.is_ambiguous("Who manages the sales team")
+    assert detector.is_ambiguous("list all employees in the sales department")
+    assert detector.is_ambiguous("short one")
+    assert not detector.is_ambiguous("list employees in the sales department.")
+
+
+def test_regex_detector_with_backreferences():
+    """Test that patterns with group references are still matched individually."""
+    detector = RegexAmbiguityDetector([r"\b(\w+) \1\b", r"^zzz"])
+
+    assert detector._combined_re is None
+    assert detector.is_ambiguous("list the the employees in sales.")
+    assert not detector.is_ambiguous("list the employees in sales.")
+
+    detector = RegexAmbiguityDetector([r"(a)b", r"(x)?y(?(1)z|w)"])
+    assert detector._combined_re is None
+    assert detector.is_ambiguous("xyz")
+
+
+def test_default_detectors_share_matchers():
+    """Test that default detectors reuse the class-level compiled matchers."""
+    first, second = SimpleAmbiguityDetector(), SimpleAmbiguityDetector()
+    assert first.ambiguous_keywords is second.ambiguous_keywords
+    assert first._keyword_re is second._keyword_re
+
+    first, second = RegexAmbiguityDetector(), RegexAmbiguityDetector()
+    assert first.compiled_patterns is second.compiled_patterns
+    assert first._combined_re is second._combined_re
+
+
+def test_default_simple_detector_is_shared():
+    """Test that the default detector is created once per process."""
+    detector = default_simple_detector()
+    assert isinstance(detector, SimpleAmbiguityDetector)
+    assert default_simple_detector() is detector
+
+
+def test_detector_result_cache():
+    """Test that repeated queries are answered from the result cache."""
+    detector = SimpleAmbiguityDetector(cache_size=2)
+
+    assert detector.is_ambiguous("which employees")
+    assert detector.is_ambiguous("which employees")
+    assert not detector.is_ambiguous("list employees in sales")
+    assert detector.is_ambiguous("short")
+
+    info = detector.cache_info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (1, 3, 2, 2)
+
+    detector.cache_clear()
+    assert detector.cache_info().currsize == 0
+
+
+def test_callback_detector_caching_is_opt_in():
+    """Test that the callback detector only caches when asked to."""
+    callback = MagicMock(return_value=False)
+
+    uncached = CallbackAmbiguityDetector(callback)
+    uncached.is_ambiguous("list employees")
+    uncached.is_ambiguous("list employees")
+    assert callback.call_count == 2
+
+    callback.reset_mock()
+    cached = CallbackAmbiguityDetector(callback, cache_size=16)
+    cached.is_ambiguous("list employees")
+    cached.is_ambiguous("list employees")
+    assert callback.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_callback_detector_async():
+    """Test the async path with coroutine and blocking callbacks."""
+
+    async def classify(query):
+        return "maybe" in query
+
+    detector = CallbackAmbiguityDetector(classify)
+    assert await detector.is_ambiguous_async("maybe employees")
+    assert not await detector.is_ambiguous_async("list employees")
+
+    detector = CallbackAmbiguityDetector(lambda query: query.endswith("?"))
+    assert await detector.is_ambiguous_async("employees?")
+
+
+def test_callback_detector_sync_with_async_callback():
+    """Test that a coroutine callback also works from synchronous code."""
+
+    async def classify(query):
+        return "maybe" in query
+
+    detector = CallbackAmbiguityDetector(classify)
+    assert detector.is_ambiguous("maybe employees")
+    assert detector.is_ambiguous_batch(["maybe a", "list b"]) == [True, False]
+
+
+def test_callback_detector_batch():
+    """Test that uncached queries go to the batch callback in one call."""
+    callback = MagicMock(return_value=True)
+    batch_callback = MagicMock(side_effect=lambda qs: ["?" in q for q in qs])
+    detector = CallbackAmbiguityDetector(
+        callback, cache_size=16, batch_callback=batch_callback
+    )
+
+    assert detector.is_ambiguous("cached?")
+    assert detector.is_ambiguous_batch(["cached?", "a?", "b"]) == [True, True, False]
+    batch_callback.assert_called_once_with(["a?", "b"])
+    callback.assert_called_once()
+
+
+def test_callback_detector_batch_error():
+    """Test that a failing batch callback marks the queries as ambiguous."""
+    detector = CallbackAmbiguityDetector(
+        MagicMock(), batch_callback=MagicMock(return_value=[False])
+    )
+    assert detector.is_ambiguous_batch(["a", "b"]) == [True, True]
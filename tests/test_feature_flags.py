@@ -116,6 +116,14 @@ class TestFeatureFlagManager:
         assert len(flags) == len(FeatureFlag)
         assert all(isinstance(v, bool) for v in flags.values())
 
+    def test_flags_are_read_only(self):
+        """Test that flags can only be changed through set_flag."""
+        manager = FeatureFlagManager()
+
+        with pytest.raises(TypeError):
+            manager.flags["enable_query_graph"] = False
+        assert manager.flags["enable_query_graph"] is True
+
     def test_get_enabled_features(self):
         """Test getting only enabled features."""
         config = {
@@ -197,6 +205,24 @@ class TestFeatureFlagDecorator:
         result = await test_function(ctx=ctx)
         assert result["error"] == "Feature 'enable_query_graph' is not enabled"
 
+    def test_cached_state_follows_the_manager(self):
+        """Test that the cached flag state is tied to the manager it came from."""
+        enabled_ctx, disabled_ctx = MagicMock(), MagicMock()
+        enabled_ctx.lifespan_ctx.feature_flags = FeatureFlagManager(
+            {"feature_flags": {"enable_query_graph": True}}
+        )
+        disabled_ctx.lifespan_ctx.feature_flags = FeatureFlagManager(
+            {"feature_flags": {"enable_query_graph": False}}
+        )
+
+        @feature_flag_required(FeatureFlag.ENABLE_QUERY_GRAPH)
+        def test_function(ctx):
+            return {"result": "success"}
+
+        assert test_function(ctx=enabled_ctx) == {"result": "success"}
+        assert test_function(ctx=disabled_ctx)["enabled"] is False
+        assert test_function(ctx=enabled_ctx) == {"result": "success"}
+
     def test_custom_error_message(self):
         """Test decorator with custom error message."""
         ctx = MagicMock()
@@ -227,6 +253,26 @@ class TestFeatureFlagDecorator:
         result = test_function(ctx, "test_data")
         assert result == {"data": "test_data"}
 
+    def test_runtime_flag_change_invalidates_cached_state(self):
+        """Test that the decorator picks up runtime flag changes."""
+        manager = FeatureFlagManager(
+            {"feature_flags": {"enable_flag_runtime_updates": True}}
+        )
+        ctx = MagicMock()
+        ctx.lifespan_ctx.feature_flags = manager
+
+        @feature_flag_required(FeatureFlag.ENABLE_QUERY_GRAPH)
+        def test_function(ctx):
+            return {"result": "success"}
+
+        assert test_function(ctx=ctx) == {"result": "success"}
+
+        manager.set_flag(FeatureFlag.ENABLE_QUERY_GRAPH, False)
+        assert test_function(ctx=ctx)["enabled"] is False
+
+        manager.set_flag(FeatureFlag.ENABLE_QUERY_GRAPH, True)
+        assert test_function(ctx=ctx) == {"result": "success"}
+
 
 class TestCheckFeatureFlag:
     """Test cases for the check_feature_flag utility."""
@@ -0,0 +1,329 @@
+"""
+Tests for the query executor implementations.
+"""
+
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from textql_mcp.utils.query_executor import (
+    CallbackQueryExecutor,
+    LLMQueryExecutor,
+    SpannerQueryExecutor,
+)
+
+
+@pytest.fixture
+def spanner_client():
+    """A mock Spanner client whose database returns two rows."""
+    client = MagicMock()
+    database = client.instance.return_value.database.return_value
+    snapshot = database.snapshot.return_value.__enter__.return_value
+    results = MagicMock()
+    results.fields = [MagicMock(), MagicMock()]
+    results.fields[0].name = "id"
+    results.fields[1].name = "label"
+    results.__iter__.return_value = iter([("Q1", "Universe"), ("Q2", "Earth")])
+    snapshot.execute_sql.return_value = results
+    return client
+
+
+@pytest.fixture
+def executor(spanner_client):
+    """A SpannerQueryExecutor wired to the mock client."""
+    with patch("textql_mcp.utils.query_executor.SPANNER_AVAILABLE", True):
+        executor = SpannerQueryExecutor(
+            "instance", "database", spanner_client=spanner_client, pool_size=0
+        )
+    yield executor
+    executor.close()
+
+
+def test_spanner_executor_shares_database_across_agent_types(executor, spanner_client):
+    """Test that all agent types reuse one database handle."""
+    assert executor._get_database("default") is executor._get_database("CNE")
+    spanner_client.instance.return_value.database.assert_called_once_with("database")
+
+
+def test_spanner_executor_returns_rows(executor):
+    """Test that rows are returned as JSON objects keyed by column name."""
+    result = executor.execute_query("GRAPH g MATCH (n) RETURN n.id, n.label")
+
+    assert result["result"] == (
+        '[{"id": "Q1", "label": "Universe"}, {"id": "Q2", "label": "Earth"}]'
+    )
+    assert "error" not in result
+
+
+def test_spanner_executor_batches_queries_in_one_snapshot(executor, spanner_client):
+    """Test that execute_queries runs every query in a single snapshot."""
+    database = spanner_client.instance.return_value.database.return_value
+    snapshot = database.snapshot.return_value.__enter__.return_value
+    snapshot.execute_sql.side_effect = [
+        snapshot.execute_sql.return_value,
+        Exception("bad"),
+    ]
+
+    results = executor.execute_queries(
+        ["GRAPH g MATCH (n) RETURN n.id, n.label", "GRAPH g MATCH (n) RETURN n"]
+    )
+
+    database.snapshot.assert_called_once_with(multi_use=True)
+    assert snapshot.execute_sql.call_count == 2
+    assert '"Universe"' in results[0]["result"]
+    assert results[1]["error"] == "bad"
+
+
+def test_spanner_executor_read_scope_reuses_snapshot(executor, spanner_client):
+    """Test that queries inside read_scope share one multi-use snapshot."""
+    database = spanner_client.instance.return_value.database.return_value
+    snapshot = database.snapshot.return_value.__enter__.return_value
+
+    with executor.read_scope():
+        executor.execute_query("GRAPH g MATCH (n) RETURN n LIMIT 1")
+        with executor.read_scope():
+            executor.execute_query("GRAPH g MATCH (n) RETURN n LIMIT 2")
+
+    database.snapshot.assert_called_once_with(multi_use=True)
+    assert snapshot.execute_sql.call_count == 2
+
+    executor.execute_query("GRAPH g MATCH (n) RETURN n LIMIT 3")
+    database.snapshot.assert_called_with()
+
+
+def test_spanner_executor_passes_query_params(executor, spanner_client):
+    """Test that params and param_types reach execute_sql unchanged."""
+    query = "GRAPH g MATCH (n {id: @id}) RETURN n.label LIMIT 1"
+    types = {"id": MagicMock()}
+
+    executor.execute_query(query, params={"id": "Q1"}, param_types=types)
+
+    database = spanner_client.instance.return_value.database.return_value
+    snapshot = database.snapshot.return_value.__enter__.return_value
+    snapshot.execute_sql.assert_called_once_with(
+        query, params={"id": "Q1"}, param_types=types
+    )
+
+
+def test_spanner_executor_result_cache(spanner_client):
+    """Test that cached results are copied, expire, and skip DML."""
+    with patch("textql_mcp.utils.query_executor.SPANNER_AVAILABLE", True):
+        executor = SpannerQueryExecutor(
+            "instance",
+            "database",
+            spanner_client=spanner_client,
+            pool_size=0,
+            cache_size=8,
+        )
+    database = spanner_client.instance.return_value.database.return_value
+    snapshot = database.snapshot.return_value.__enter__.return_value
+
+    first = executor.execute_query("GRAPH g MATCH (n) RETURN n LIMIT 1")
+    first["result"] = "mutated"
+    second = executor.execute_query("  GRAPH g MATCH (n) RETURN n LIMIT 1;")
+    assert snapshot.execute_sql.call_count == 1
+    assert second["result"] != "mutated"
+
+    executor.execute_query("GRAPH g MATCH (n) RETURN n LIMIT 1", "CNE")
+    executor.execute_query("WITH d AS (DELETE FROM t) SELECT 1 LIMIT 1")
+    executor.execute_query("WITH d AS (DELETE FROM t) SELECT 1 LIMIT 1")
+    assert snapshot.execute_sql.call_count == 4
+
+    with patch("textql_mcp.utils.query_executor.time.monotonic", return_value=1e12):
+        executor.execute_query("GRAPH g MATCH (n) RETURN n LIMIT 1")
+    assert snapshot.execute_sql.call_count == 5
+    executor.close()
+
+
+def test_spanner_executor_rejects_non_read_queries(executor, spanner_client):
+    """Test that write statements fail without opening a snapshot."""
+    result = executor.execute_query("DELETE FROM Nodes WHERE true")
+
+    assert result["error"].startswith("Only read-only queries")
+    spanner_client.instance.return_value.database.return_value.snapshot.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_spanner_executor_async(executor):
+    """Test that aexecute_query returns the same rows as execute_query."""
+    result = await executor.aexecute_query("GRAPH g MATCH (n) RETURN n.id, n.label")
+    assert '"Universe"' in result["result"]
+
+
+@pytest.mark.asyncio
+async def test_spanner_executor_async_uses_own_threads(executor, spanner_client):
+    """Test that aexecute_query runs on the executor's pool and sees read_scope."""
+    database = spanner_client.instance.return_value.database.return_value
+    snapshot = database.snapshot.return_value.__enter__.return_value
+    thread_names = []
+    snapshot.execute_sql.side_effect = lambda query: thread_names.append(
+        threading.current_thread().name
+    )
+
+    with executor.read_scope():
+        await executor.aexecute_query("GRAPH g MATCH (n) RETURN n LIMIT 1")
+
+    database.snapshot.assert_called_once_with(multi_use=True)
+    assert thread_names[0].startswith("spanner-qx")
+
+
+@pytest.mark.asyncio
+async def test_spanner_executor_async_init_and_close(executor, spanner_client):
+    """Test that async_init opens the database and close() allows reopening."""
+    instance = spanner_client.instance.return_value
+
+    await executor.async_init()
+    instance.database.assert_called_once_with("database")
+
+    executor.close()
+    result = await executor.aexecute_query("GRAPH g MATCH (n) RETURN n LIMIT 1")
+    assert "error" not in result
+    assert instance.database.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_callback_executor_async_callback():
+    """Test that coroutine callbacks are awaited, and errors are reported."""
+
+    async def run(query, agent_type):
+        if query == "bad":
+            raise ValueError("boom")
+        return {"result": f"{agent_type}:{query}", "intermediate_steps": []}
+
+    executor = CallbackQueryExecutor(run)
+    assert (await executor.aexecute_query("q", "CNE"))["result"] == "CNE:q"
+    assert (await executor.aexecute_query("bad"))["error"] == "boom"
+
+
+def test_callback_executor_async_callback_from_sync():
+    """Test that coroutine callbacks also work through execute_query."""
+
+    async def run(query, agent_type):
+        return {"result": f"{agent_type}:{query}", "intermediate_steps": []}
+
+    executor = CallbackQueryExecutor(run)
+    assert executor.execute_query("q")["result"] == "default:q"
+
+
+@pytest.mark.asyncio
+async def test_callback_executor_sync_callback_from_async():
+    """Test that blocking callbacks also work through aexecute_query."""
+    executor = CallbackQueryExecutor(lambda query, agent_type: {"result": query})
+    assert (await executor.aexecute_query("q"))["result"] == "q"
+
+
+@pytest.mark.asyncio
+async def test_callback_executor_result_cache():
+    """Test that cached callback results skip the callback until they expire."""
+    calls = []
+
+    async def run(query, agent_type):
+        calls.append(query)
+        if query == "bad":
+            return {"result": "", "error": "boom"}
+        return {"result": f"{agent_type}:{query}", "intermediate_steps": []}
+
+    executor = CallbackQueryExecutor(run, cache_size=8)
+    assert (await executor.aexecute_query("q"))["result"] == "default:q"
+    assert (await executor.aexecute_query("q;"))["result"] == "default:q"
+    await executor.aexecute_query("q", "CNE")
+    await executor.aexecute_query("bad")
+    await executor.aexecute_query("bad")
+    assert calls == ["q", "q", "bad", "bad"]
+
+    with patch("textql_mcp.utils.query_executor.time.monotonic", return_value=1e12):
+        await executor.aexecute_query("q")
+    assert len(calls) == 5
+
+
+def test_callback_executor_skips_caching_uncopyable_results():
+    """Test that a result that cannot be deep-copied is returned, not failed."""
+    lock = threading.Lock()
+    callback = MagicMock(return_value={"result": "ok", "handle": lock})
+    executor = CallbackQueryExecutor(callback, cache_size=8)
+
+    assert executor.execute_query("q")["handle"] is lock
+    assert executor.execute_query("q")["result"] == "ok"
+    assert callback.call_count == 2
+
+
+def test_llm_executor_caches_chains():
+    """Test that the chain factory runs once per agent type."""
+    factory = MagicMock()
+    executor = LLMQueryExecutor(factory)
+
+    executor.execute_query("q1")
+    executor.execute_query("q2")
+    executor.execute_query("q3", "CNE")
+
+    assert factory.call_count == 2
+    factory.return_value.invoke.assert_called_with("q3")
+
+
+def test_llm_executor_batches_queries():
+    """Test that execute_queries sends batch_size queries per batch call."""
+    chain = MagicMock()
+    chain.batch.side_effect = lambda queries: [{"result": q} for q in queries]
+    executor = LLMQueryExecutor(lambda agent_type: chain, batch_size=2)
+
+    results = executor.execute_queries(["q1", "q2", "q3"])
+
+    assert [r["result"] for r in results] == ["q1", "q2", "q3"]
+    assert chain.batch.call_count == 2
+    chain.invoke.assert_not_called()
+
+
+def test_llm_executor_batches_only_uncached_queries():
+    """Test that execute_queries reads and fills the per-query result cache."""
+    chain = MagicMock()
+    chain.batch.side_effect = lambda queries: [{"result": q} for q in queries]
+    chain.invoke.side_effect = lambda query: {"result": query}
+    executor = LLMQueryExecutor(lambda agent_type: chain, cache_size=8)
+
+    executor.execute_query("q1")
+    results = executor.execute_queries(["q1", "q2", "q3"])
+    assert [r["result"] for r in results] == ["q1", "q2", "q3"]
+    chain.batch.assert_called_once_with(["q2", "q3"])
+
+    assert executor.execute_query("q3")["result"] == "q3"
+    assert chain.invoke.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_llm_executor_prefers_ainvoke():
+    """Test that chains with a native ainvoke are awaited directly."""
+    chain = MagicMock()
+    chain.ainvoke = AsyncMock(return_value={"result": "async"})
+    executor = LLMQueryExecutor(lambda agent_type: chain)
+
+    assert (await executor.aexecute_query("q"))["result"] == "async"
+    chain.invoke.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("GRAPH g MATCH (n) RETURN n.id;", "GRAPH g MATCH (n) RETURN n.id LIMIT 100"),
+        (
+            "GRAPH g MATCH (n) RETURN n.id ;\n",
+            "GRAPH g MATCH (n) RETURN n.id LIMIT 100",
+        ),
+        (
+            "GRAPH g MATCH (n) RETURN n.country",
+            "GRAPH g MATCH (n) RETURN n.country LIMIT 100",
+        ),
+        (
+            "GRAPH g MATCH (n) RETURN n.id Limit 5",
+            "GRAPH g MATCH (n) RETURN n.id Limit 5",
+        ),
+        ("GRAPH g MATCH (n) RETURN COUNT(n)", "GRAPH g MATCH (n) RETURN COUNT(n)"),
+    ],
+)
+def test_spanner_executor_limit_injection(executor, spanner_client, query, expected):
+    """Test that LIMIT is only appended to unbounded queries."""
+    executor.execute_query(query)
+
+    database = spanner_client.instance.return_value.database.return_value
+    snapshot = database.snapshot.return_value.__enter__.return_value
+    snapshot.execute_sql.assert_called_once_with(expected)
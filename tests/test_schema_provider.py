@@ -2,14 +2,20 @@
 Tests for the schema provider implementations.
 """
 
+import asyncio
 import os
 import tempfile
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
 
 from textql_mcp.utils.schema_provider import (
     FileSchemaProvider,
     StringSchemaProvider,
     MultiAgentSchemaProvider,
 )
+from textql_mcp.utils.schema_provider_spanner import SpannerSchemaProvider
 
 
 def test_string_schema_provider(simple_schema):
@@ -44,6 +50,106 @@ def test_file_schema_provider(simple_schema):
             os.unlink(file_path)
 
 
+def test_file_schema_provider_caches_until_modified(simple_schema):
+    """Test that the file is re-read only after it changes."""
+    with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
+        f.write(simple_schema)
+        file_path = f.name
+
+    try:
+        provider = FileSchemaProvider(file_path, check_interval=0)
+        assert provider.get_schema("q") is FileSchemaProvider(file_path).get_schema("q")
+
+        with open(file_path, "w") as f:
+            f.write("type Query { updated: String }")
+        stat = os.stat(file_path)
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert "updated" in provider.get_schema("q")
+    finally:
+        if os.path.exists(file_path):
+            os.unlink(file_path)
+
+
+def test_file_schema_provider_throttles_mtime_checks(simple_schema):
+    """Test that the file is stat'ed at most once per check_interval."""
+    with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
+        f.write(simple_schema)
+        file_path = f.name
+
+    try:
+        provider = FileSchemaProvider(file_path, check_interval=60)
+        with patch("textql_mcp.utils.schema_provider.os.stat", wraps=os.stat) as stat:
+            provider.get_schema("q")
+            provider.get_schema("q")
+            stat.assert_not_called()
+
+            with patch(
+                "textql_mcp.utils.schema_provider.time.monotonic",
+                return_value=time.monotonic() + 61,
+            ):
+                provider.get_schema("q")
+            stat.assert_called_once()
+    finally:
+        if os.path.exists(file_path):
+            os.unlink(file_path)
+
+
+@pytest.mark.asyncio
+async def test_file_schema_provider_create(simple_schema):
+    """Test that the async constructor loads the schema off the event loop."""
+    with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
+        f.write(simple_schema)
+        file_path = f.name
+
+    try:
+        with patch(
+            "textql_mcp.utils.schema_provider.asyncio.to_thread",
+            wraps=asyncio.to_thread,
+        ) as to_thread:
+            provider = await FileSchemaProvider.create(file_path)
+
+        to_thread.assert_called_once()
+        assert "type Employee" in provider.get_schema("q")
+    finally:
+        if os.path.exists(file_path):
+            os.unlink(file_path)
+
+    missing = await FileSchemaProvider.create(file_path)
+    assert missing.get_schema("q").startswith("Error:")
+
+
+@pytest.mark.asyncio
+async def test_file_schema_provider_async_init_refreshes(simple_schema):
+    """Test that async_init picks up edits regardless of check_interval."""
+    with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
+        f.write(simple_schema)
+        file_path = f.name
+
+    try:
+        provider = FileSchemaProvider(file_path, check_interval=60)
+        with open(file_path, "w") as f:
+            f.write("type Query { refreshed: String }")
+        stat = os.stat(file_path)
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert "refreshed" not in provider.get_schema("q")
+        await provider.async_init()
+        assert "refreshed" in provider.get_schema("q")
+    finally:
+        if os.path.exists(file_path):
+            os.unlink(file_path)
+
+
+@pytest.mark.asyncio
+async def test_file_schema_provider_unreadable_path():
+    """Test that unreadable paths are reported by get_schema, not raised."""
+    with tempfile.TemporaryDirectory() as directory:
+        assert FileSchemaProvider(directory).get_schema("q").startswith("Error:")
+        provider = await FileSchemaProvider.create(directory)
+        assert provider.get_schema("q").startswith("Error:")
+
+
 def test_multi_agent_schema_provider():
     """Test the MultiAgentSchemaProvider."""
     # Create schemas for different agent types
@@ -85,3 +191,71 @@ def test_multi_agent_schema_provider():
     # Check default schema for unknown agent type
     default_result = provider.get_schema("Get all data", "UNKNOWN")
     assert "type Company" in default_result
+
+
+def test_spanner_schema_provider_serializes_once():
+    """Test that the Spanner schema JSON is built once and reused."""
+    with patch("textql_mcp.utils.schema_provider_spanner.SPANNER_AVAILABLE", True):
+        provider = SpannerSchemaProvider(
+            "instance", "database", spanner_client=MagicMock()
+        )
+
+    with patch("textql_mcp.utils.schema_provider_spanner.json.dumps") as dumps:
+        dumps.return_value = '{"graph_name": "wikidata_graph"}'
+        first = provider.get_schema("q")
+        second = provider.get_schema("other", "CNE")
+
+    dumps.assert_called_once()
+    assert first is second
+
+
+def test_spanner_schema_provider_type_checks():
+    """Test the entity and relationship type membership checks."""
+    with patch("textql_mcp.utils.schema_provider_spanner.SPANNER_AVAILABLE", True):
+        provider = SpannerSchemaProvider(
+            "instance", "database", spanner_client=MagicMock()
+        )
+
+    assert provider.is_entity_type("Company")
+    assert not provider.is_entity_type("company")
+    assert provider.is_relationship_type("WORKED_AT")
+    assert not provider.is_relationship_type("Company")
+    assert "Company" in provider.entity_types
+    assert "WORKED_AT" in provider.relationship_types
+    with pytest.raises(AttributeError):
+        provider.entity_types.append("Planet")
+
+
+def test_spanner_schema_provider_detect_types():
+    """Test that type names are found case-insensitively on word boundaries."""
+    with patch("textql_mcp.utils.schema_provider_spanner.SPANNER_AVAILABLE", True):
+        provider = SpannerSchemaProvider(
+            "instance", "database", spanner_client=MagicMock()
+        )
+
+    query = "Which person worked_at a company or an educational institution?"
+    assert provider.detect_types(query) == {
+        "Person",
+        "WORKED_AT",
+        "Company",
+        "Educational Institution",
+    }
+    assert provider.detect_types("companys and WORKED_AT_X") == set()
+
+
+def test_spanner_schema_provider_opens_database_lazily():
+    """Test that no database handle is opened until one is needed."""
+    client = MagicMock()
+    executor_database = MagicMock()
+    with patch("textql_mcp.utils.schema_provider_spanner.SPANNER_AVAILABLE", True):
+        provider = SpannerSchemaProvider(
+            "instance",
+            "database",
+            spanner_client=client,
+            database_factory=lambda: executor_database,
+        )
+
+    provider.get_schema("q")
+    client.instance.return_value.database.assert_not_called()
+    assert provider.database is executor_database
+    assert provider.database is executor_database
@@ -0,0 +1,321 @@
+"""
+Tests for the core server helpers.
+"""
+
+import asyncio
+import copy
+import logging
+import os
+import queue
+import tempfile
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from textql_mcp.core.server import (
+    AppContext,
+    _CachedSchemaProvider,
+    _DroppingQueueHandler,
+    create_mcp_server,
+    extract_gql_query,
+    get_app_context_or_fallback,
+    load_config,
+    result_needs_refinement,
+)
+from textql_mcp.utils.schema_provider import FileSchemaProvider
+
+
+def test_load_config_from_toml():
+    """Test loading configuration from a TOML file."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".toml", delete=False) as f:
+        f.write(
+            'PROJECT_ID = "test-project"\n\n[feature_flags]\nenable_query_graph = false\n'
+        )
+        file_path = f.name
+
+    try:
+        config = load_config(file_path)
+        assert config["PROJECT_ID"] == "test-project"
+        assert config["feature_flags"]["enable_query_graph"] is False
+    finally:
+        if os.path.exists(file_path):
+            os.unlink(file_path)
+
+
+def test_load_config_invalid_toml_falls_back_to_env():
+    """Test that an unparsable config file falls back to environment variables."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".toml", delete=False) as f:
+        f.write("this is not = = valid toml\n")
+        file_path = f.name
+
+    try:
+        config = load_config(file_path)
+        assert "PROJECT_ID" in config
+        assert isinstance(config["AGENT_TYPES"], list)
+    finally:
+        if os.path.exists(file_path):
+            os.unlink(file_path)
+
+
+def test_load_config_without_path():
+    """Test loading configuration from environment variables only."""
+    config = load_config(None)
+    assert config["HOST"]
+    assert isinstance(config["PORT"], int)
+
+
+def test_create_mcp_server_with_preloaded_config():
+    """Test that a pre-loaded config skips load_config entirely."""
+    with patch("textql_mcp.core.server.load_config") as mock_load_config:
+        server = create_mcp_server(config={"PROJECT_ID": "embedded"})
+
+    mock_load_config.assert_not_called()
+    assert server is not None
+
+
+@pytest.mark.asyncio
+async def test_query_graph_uses_closure_context():
+    """Test that query_graph falls back to the server's own app context."""
+    executor = MagicMock()
+    executor.execute_query.return_value = {"result": "ok", "intermediate_steps": []}
+    server = create_mcp_server(query_executor=executor, config={})
+
+    _, structured = await server.call_tool("query_graph", {"gql_query": "{ a }"})
+
+    executor.execute_query.assert_called_once_with("{ a }", "default")
+    assert structured["result"]["result"] == "ok"
+    assert structured["result"]["error"] == ""
+
+
+def test_get_app_context_returns_app_context():
+    """Test that the helper hands back the AppContext itself."""
+    app_context = AppContext(
+        config={"PROJECT_ID": "p"},
+        schema_provider=MagicMock(),
+        query_executor=MagicMock(),
+        ambiguity_detector=MagicMock(),
+        feature_flags=MagicMock(),
+    )
+
+    resolved = get_app_context_or_fallback(SimpleNamespace(lifespan_ctx=app_context))
+    assert resolved is app_context
+    assert resolved.config == {"PROJECT_ID": "p"}
+    assert get_app_context_or_fallback(None, app_context) is app_context
+    with pytest.raises(ValueError):
+        get_app_context_or_fallback(None)
+
+
+class CountingSchemaProvider:
+    """Schema provider that counts how often it is called."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_schema(self, query, agent_type="default"):
+        self.calls += 1
+        return f"schema {self.calls} for {agent_type}"
+
+
+@pytest.mark.asyncio
+async def test_schema_resource_is_cached():
+    """Test that the full-schema resource serves repeated reads from cache."""
+    provider = CountingSchemaProvider()
+    server = create_mcp_server(schema_provider=provider, config={})
+
+    first = await server.read_resource("http://localhost/schema")
+    second = await server.read_resource("http://localhost/schema")
+
+    assert provider.calls == 1
+    assert first[0].content == second[0].content
+
+
+@pytest.mark.asyncio
+async def test_stale_schema_resource_is_refreshed_in_background():
+    """Test that a stale entry is served while a refresh runs."""
+    provider = CountingSchemaProvider()
+    server = create_mcp_server(schema_provider=provider, config={})
+
+    with patch("textql_mcp.core.server.SCHEMA_CACHE_TTL", 0.0):
+        await server.read_resource("http://localhost/schema/CNE")
+        stale = await server.read_resource("http://localhost/schema/CNE")
+
+    assert "schema 1 for CNE" in stale[0].content
+    for _ in range(100):
+        if provider.calls == 2:
+            break
+        time.sleep(0.01)
+    assert provider.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_dropped_log_records_are_counted_and_reported():
+    """Test that a full log queue counts dropped records for the health check."""
+    handler = _DroppingQueueHandler(queue.Queue(maxsize=1))
+    records = [
+        logging.LogRecord("t", level, __file__, 1, "msg", None, None)
+        for level in (logging.INFO, logging.DEBUG, logging.ERROR)
+    ]
+
+    with patch("textql_mcp.core.server.LOG_QUEUE_PUT_TIMEOUT", 0.01):
+        for record in records:
+            handler.enqueue(record)
+    assert handler.dropped == 2
+
+    server = create_mcp_server(config={})
+    with patch("textql_mcp.core.server._log_handler", handler):
+        health = await server.read_resource("http://localhost/health")
+    assert '"dropped_log_records": 2' in health[0].content
+
+
+def test_extract_gql_query_from_code_block():
+    """Test extracting a query from a fenced code block."""
+    text = "Here is the query:\n```graphql\n{ employees { name } }\n```\nDone."
+    assert extract_gql_query(text) == "{ employees { name } }"
+
+
+def test_extract_gql_query_bare_query():
+    """Test that a bare query is returned as-is, minus outer whitespace."""
+    assert extract_gql_query("\n  { company { name } }  \n") == "{ company { name } }"
+
+
+def test_extract_gql_query_from_prose():
+    """Test extracting a query surrounded by explanation text."""
+    text = "The query is { employees { name } } and it lists names."
+    assert extract_gql_query(text) == "{ employees { name } }"
+
+
+def test_extract_gql_query_fallback_spans_braces():
+    """Test the fallback that keeps everything between the outer braces."""
+    text = "Try this:\n{\n  company\n}\nThanks"
+    assert extract_gql_query(text) == "{\n  company\n}"
+
+
+def test_extract_gql_query_fallback_stops_at_matching_brace():
+    """Test that the fallback ends at the brace matching the first opening one."""
+    text = "Try {\n  company\n} or maybe {employees}"
+    assert extract_gql_query(text) == "{\n  company\n}"
+
+
+def test_extract_gql_query_without_braces():
+    """Test that text without a query is returned stripped."""
+    assert extract_gql_query("  no query here  ") == "no query here"
+
+
+def test_result_needs_refinement():
+    """Test detection of empty or failed results regardless of case."""
+    assert result_needs_refinement({"result": "Sorry, No Results Found."})
+    assert result_needs_refinement({"result": "That is not in our database"})
+    assert not result_needs_refinement({"result": "Alice, Bob"})
+    assert not result_needs_refinement({})
+
+
+@pytest.mark.asyncio
+async def test_schema_lookups_are_cached():
+    """Test that repeated get_schema_for_query calls hit the lookup cache."""
+    provider = CountingSchemaProvider()
+    server = create_mcp_server(
+        schema_provider=provider, config={"SCHEMA_CACHE_SIZE": 256}
+    )
+
+    await server.call_tool("get_schema_for_query", {"query": "employees"})
+    _, structured = await server.call_tool(
+        "get_schema_for_query", {"query": "employees"}
+    )
+    await server.call_tool(
+        "get_schema_for_query", {"query": "employees", "agent_type": "CNE"}
+    )
+
+    assert structured["result"]["schema_info"] == "schema 1 for default"
+    assert provider.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_schema_lookup_cache_is_opt_in():
+    """Test that without a cache size the provider is called every time."""
+    provider = CountingSchemaProvider()
+    server = create_mcp_server(schema_provider=provider, config={})
+
+    await server.call_tool("get_schema_for_query", {"query": "employees"})
+    await server.call_tool("get_schema_for_query", {"query": "employees"})
+
+    assert provider.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_schema_lookups_see_file_changes_after_ttl():
+    """Test that cached lookups expire so an edited schema file is served."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".graphql", delete=False) as f:
+        f.write("type Query { a: String }")
+        file_path = f.name
+
+    try:
+        provider = FileSchemaProvider(file_path, check_interval=0)
+        server = create_mcp_server(
+            schema_provider=provider, config={}, schema_cache_size=256
+        )
+        await server.call_tool("get_schema_for_query", {"query": "employees"})
+
+        with open(file_path, "w") as f:
+            f.write("type Query { b: String }")
+        stat = os.stat(file_path)
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        with patch("textql_mcp.core.server.SCHEMA_CACHE_TTL", 0.0):
+            _, structured = await server.call_tool(
+                "get_schema_for_query", {"query": "employees"}
+            )
+    finally:
+        if os.path.exists(file_path):
+            os.unlink(file_path)
+
+    assert structured["result"]["schema_info"] == "type Query { b: String }"
+
+
+def test_cached_schema_provider_uninitialized_attribute_lookup():
+    """Test that attribute lookups before __init__ fail instead of recursing."""
+    wrapper = _CachedSchemaProvider.__new__(_CachedSchemaProvider)
+    assert not hasattr(wrapper, "detect_types")
+
+    wrapper = _CachedSchemaProvider(CountingSchemaProvider(), 8)
+    assert copy.copy(wrapper).calls == 0
+
+
+@pytest.mark.asyncio
+async def test_lifespan_runs_async_init_concurrently():
+    """Test that async_init hooks run together and the executor is closed."""
+    started = []
+    closed = []
+    release = asyncio.Event()
+
+    class SlowInit:
+        def __init__(self, name):
+            self.name = name
+
+        async def async_init(self):
+            started.append(self.name)
+            if len(started) == 2:
+                release.set()
+            await asyncio.wait_for(release.wait(), timeout=1)
+
+        def get_schema(self, query, agent_type="default"):
+            return ""
+
+        def execute_query(self, query, agent_type="default"):
+            return {}
+
+        def close(self):
+            closed.append(self.name)
+
+    server = create_mcp_server(
+        schema_provider=SlowInit("schema"),
+        query_executor=SlowInit("executor"),
+        config={},
+    )
+
+    async with server.settings.lifespan(server) as app_context:
+        assert app_context.config == {}
+
+    assert sorted(started) == ["executor", "schema"]
+    assert closed == ["executor"]
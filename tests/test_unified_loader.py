@@ -0,0 +1,79 @@
+"""
+Tests for the Wikidata unified loader.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("google.cloud.bigquery")
+pytest.importorskip("google.cloud.spanner")
+pytest.importorskip("tqdm")
+
+from textql_mcp.wikidata.unified_loader import (  # noqa: E402
+    _ENTITY_TYPE_MAP,
+    UnifiedLoader,
+)
+
+
+class FakeRowIterator:
+    """Mimics a BigQuery RowIterator, which can only be started once."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.total_rows = len(rows)
+        self._started = False
+
+    def __iter__(self):
+        self._started = True
+        return iter(self.rows)
+
+    def to_arrow_iterable(self, bqstorage_client=None):
+        if self._started:
+            raise ValueError("Iterator has already started")
+        self._started = True
+        record_batch = MagicMock()
+        record_batch.to_pylist.return_value = self.rows
+        return iter([record_batch])
+
+
+@pytest.fixture
+def loader():
+    """A UnifiedLoader with mocked clients and no config file."""
+    loader = UnifiedLoader.__new__(UnifiedLoader)
+    loader.bq_client = MagicMock()
+    loader.bqstorage_client = None
+    return loader
+
+
+def _set_rows(loader, rows):
+    loader.bq_client.query.return_value.result.return_value = FakeRowIterator(rows)
+
+
+def test_iter_batches_pages_through_rows(loader):
+    """Test that rows are batched from the REST row iterator."""
+    _set_rows(loader, [{"id": i} for i in range(5)])
+
+    batches = list(loader._iter_batches("q", 2, "Loading"))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_iter_batches_with_storage_client(loader):
+    """Test that the Storage API path does not start the row iterator first."""
+    loader.bqstorage_client = MagicMock()
+    _set_rows(loader, [{"id": i} for i in range(3)])
+
+    batches = list(loader._iter_batches("q", 2, "Loading"))
+
+    assert batches == [[{"id": 0}, {"id": 1}], [{"id": 2}]]
+
+
+def test_entity_type_map_is_read_only(loader):
+    """Test that the entity type map shared by all loaders cannot be changed."""
+    loader.entity_type_map = _ENTITY_TYPE_MAP
+
+    assert loader._get_entity_type("Q5") == "Human"
+    assert loader._get_entity_type("Q6256") == "Unknown"
+    with pytest.raises(TypeError):
+        loader.entity_type_map["Q6256"] = "Country"
@@ -8,6 +8,7 @@ from .core.server import (
     run_server,
     SchemaProvider,
     QueryExecutor,
+    QueryResult,
     AmbiguityDetector,
 )
 from .main_spanner import create_mcp_server_with_spanner
@@ -20,5 +21,6 @@ __all__ = [
     "run_server",
     "SchemaProvider",
     "QueryExecutor",
+    "QueryResult",
     "AmbiguityDetector",
 ]
@@ -7,7 +7,8 @@ via configuration files or environment variables.
 
 import os
 import functools
-from typing import Dict, Any, Optional, Callable
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Callable, Mapping
 from enum import Enum
 import logging
 
@@ -53,7 +54,10 @@ class FeatureFlagManager:
         Args:
             config: Optional configuration dictionary containing feature flags
         """
-        self.flags: Dict[str, bool] = {}
+        # Private so every runtime change goes through set_flag(), which
+        # bumps the version that callers use to cache flag lookups
+        self._flags: Dict[str, bool] = {}
+        self.version = 0
         self._load_defaults()
 
         if config:
@@ -65,7 +69,7 @@ class FeatureFlagManager:
     def _load_defaults(self):
         """Load default feature flag values."""
         # Default to enabling core features, disabling admin/experimental
-        self.flags = {
+        self._flags = {
             FeatureFlag.ENABLE_QUERY_GRAPH.value: True,
             FeatureFlag.ENABLE_SCHEMA_FETCH.value: True,
             FeatureFlag.ENABLE_NATURAL_LANGUAGE.value: False,
@@ -85,7 +89,7 @@ class FeatureFlagManager:
         feature_flags = config.get("feature_flags", {})
         for flag, value in feature_flags.items():
             if flag in [f.value for f in FeatureFlag]:
-                self.flags[flag] = bool(value)
+                self._flags[flag] = bool(value)
                 logger.debug(f"Loaded feature flag from config: {flag}={value}")
             else:
                 logger.warning(f"Unknown feature flag in config: {flag}")
@@ -102,16 +106,21 @@ class FeatureFlagManager:
             env_var = f"{self.ENV_PREFIX}{flag.value.upper()}"
             if env_var in os.environ:
                 value = os.environ[env_var].lower() in ("true", "1", "yes", "on")
-                self.flags[flag.value] = value
+                self._flags[flag.value] = value
                 logger.debug(f"Loaded feature flag from env: {flag.value}={value}")
 
     def _log_flag_status(self):
         """Log the current status of all feature flags."""
         logger.info("Feature flag status:")
-        for flag, enabled in self.flags.items():
+        for flag, enabled in self._flags.items():
             status = "ENABLED" if enabled else "DISABLED"
             logger.info(f"  {flag}: {status}")
 
+    @property
+    def flags(self) -> Mapping[str, bool]:
+        """Read-only view of the flag values; change them with set_flag()."""
+        return MappingProxyType(self._flags)
+
     def is_enabled(self, flag: str) -> bool:
         """Check if a feature flag is enabled.
 
@@ -125,7 +134,7 @@ class FeatureFlagManager:
         if hasattr(flag, "value"):
             flag = flag.value
 
-        return self.flags.get(flag, False)
+        return self._flags.get(flag, False)
 
     def set_flag(self, flag: str, enabled: bool) -> bool:
         """Set a feature flag at runtime.
@@ -148,8 +157,9 @@ class FeatureFlagManager:
             logger.error(f"Unknown feature flag: {flag}")
             return False
 
-        old_value = self.flags.get(flag, False)
-        self.flags[flag] = enabled
+        old_value = self._flags.get(flag, False)
+        self._flags[flag] = enabled
+        self.version += 1
         logger.info(f"Feature flag '{flag}' changed from {old_value} to {enabled}")
         return True
 
@@ -159,7 +169,7 @@ class FeatureFlagManager:
         Returns:
             Dictionary mapping flag names to their enabled status
         """
-        return self.flags.copy()
+        return self._flags.copy()
 
     def get_enabled_features(self) -> list[str]:
         """Get a list of all enabled features.
@@ -167,7 +177,7 @@ class FeatureFlagManager:
         Returns:
             List of enabled feature flag names
         """
-        return [flag for flag, enabled in self.flags.items() if enabled]
+        return [flag for flag, enabled in self._flags.items() if enabled]
 
 
 def feature_flag_required(flag: FeatureFlag, error_message: Optional[str] = None):
@@ -189,47 +199,66 @@ def feature_flag_required(flag: FeatureFlag, error_message: Optional[str] = None
     """
 
     def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        async def async_wrapper(*args, **kwargs):
+        # Last seen manager, its version and the flag state at that version.
+        # While the manager is unchanged, the per-call check is one identity
+        # and one integer comparison instead of a full is_enabled() lookup.
+        # Kept as one tuple that is replaced whole, so a thread never sees
+        # one manager's version with another manager's state.
+        cached = (None, -1, True)
+
+        # The error response only depends on the decorator arguments, so it is
+        # built once here and copied for each rejected call
+        disabled_response = {
+            "error": error_message or f"Feature '{flag.value}' is not enabled",
+            "feature_required": flag.value,
+            "enabled": False,
+        }
+
+        def _disabled_response(args, kwargs) -> Optional[Dict[str, Any]]:
+            nonlocal cached
             # Try to get context from kwargs or args
             ctx = kwargs.get("ctx")
             if ctx is None and args:
                 # Check if first arg might be context
                 ctx = args[0] if hasattr(args[0], "lifespan_ctx") else None
 
-            if ctx and hasattr(ctx, "lifespan_ctx"):
-                feature_flags = getattr(ctx.lifespan_ctx, "feature_flags", None)
-                if feature_flags and not feature_flags.is_enabled(flag):
-                    default_msg = f"Feature '{flag.value}' is not enabled"
-                    return {
-                        "error": error_message or default_msg,
-                        "feature_required": flag.value,
-                        "enabled": False,
-                    }
-            else:
+            if not (ctx and hasattr(ctx, "lifespan_ctx")):
                 logger.warning(f"Could not access feature flags in {func.__name__}")
+                return None
+
+            feature_flags = getattr(ctx.lifespan_ctx, "feature_flags", None)
+            if not feature_flags:
+                return None
+
+            version = getattr(feature_flags, "version", None)
+            cached_flags, cached_version, enabled = cached
+            if (
+                version is None
+                or cached_flags is not feature_flags
+                or cached_version != version
+            ):
+                enabled = feature_flags.is_enabled(flag)
+                cached = (feature_flags, version, enabled)
+
+            if enabled:
+                return None
+
+            return dict(disabled_response)
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            disabled = _disabled_response(args, kwargs)
+            if disabled is not None:
+                return disabled
 
             # Call the original function
             return await func(*args, **kwargs)
 
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            # Similar logic for synchronous functions
-            ctx = kwargs.get("ctx")
-            if ctx is None and args:
-                ctx = args[0] if hasattr(args[0], "lifespan_ctx") else None
-
-            if ctx and hasattr(ctx, "lifespan_ctx"):
-                feature_flags = getattr(ctx.lifespan_ctx, "feature_flags", None)
-                if feature_flags and not feature_flags.is_enabled(flag):
-                    default_msg = f"Feature '{flag.value}' is not enabled"
-                    return {
-                        "error": error_message or default_msg,
-                        "feature_required": flag.value,
-                        "enabled": False,
-                    }
-            else:
-                logger.warning(f"Could not access feature flags in {func.__name__}")
+            disabled = _disabled_response(args, kwargs)
+            if disabled is not None:
+                return disabled
 
             return func(*args, **kwargs)
 
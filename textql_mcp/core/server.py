@@ -7,26 +7,108 @@ for sending GraphQL queries and translating natural language to GQL.
 
 import os
 import sys
+import asyncio
+import atexit
+import inspect
+import queue
 import logging
-from typing import Dict, Any, Optional, AsyncIterator, Protocol
+import logging.handlers
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Dict,
+    Any,
+    Optional,
+    AsyncIterator,
+    Protocol,
+    Sequence,
+    Set,
+    Tuple,
+    TypedDict,
+)
 from dataclasses import dataclass
 from contextlib import asynccontextmanager
 import re
 
-import toml
 from mcp.server.fastmcp import FastMCP, Context
 
 from .feature_flags import FeatureFlagManager, FeatureFlag, feature_flag_required
 
 # Set up logging
 LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler()],
-)
+LOG_QUEUE_SIZE = 10000
+# Seconds a WARNING or higher record may wait for room on a full log queue
+LOG_QUEUE_PUT_TIMEOUT = 0.1
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that sheds records instead of raising when the queue is full.
+
+    Records below WARNING are dropped at once; WARNING and above wait up to
+    LOG_QUEUE_PUT_TIMEOUT seconds for room first. Dropped records are counted
+    and reported by the health resource.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if record.levelno >= logging.WARNING:
+                self.queue.put(record, timeout=LOG_QUEUE_PUT_TIMEOUT)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+# The installed root handler, if _configure_logging() installed one
+_log_handler: Optional[_DroppingQueueHandler] = None
+
+
+def _configure_logging() -> None:
+    """
+    Install the root log handler.
+
+    Records are put on a bounded queue and written to stderr by a background
+    QueueListener thread, so request handlers never block on stream I/O.
+    Does nothing if the root logger is already configured.
+    """
+    global _log_handler
+    if logging.getLogger().handlers:
+        return
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    _log_handler = _DroppingQueueHandler(log_queue)
+    logging.basicConfig(
+        level=getattr(logging, LOG_LEVEL),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[_log_handler],
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+
+_configure_logging()
 logger = logging.getLogger("textql_mcp")
 
+# Static health response, shared by every call to the health resource.
+# Kept as a plain dict because FastMCP cannot serialize a MappingProxyType;
+# treat it as read-only.
+_HEALTH: Dict[str, str] = {"status": "healthy", "version": "0.1.0"}
+
+# Full-schema resources serve cached schemas for this many seconds before
+# refreshing them in the background (stale-while-revalidate)
+SCHEMA_CACHE_TTL = 30.0
+# Upper bound on cached agent types, since agent_type comes from the URL
+SCHEMA_CACHE_MAX_ENTRIES = 64
+
 
 class ConfigError(Exception):
     """Exception raised for configuration errors."""
@@ -57,10 +139,23 @@ class SchemaProvider(Protocol):
         ...
 
 
+class QueryResult(TypedDict, total=False):
+    """
+    Result returned by a query executor.
+
+    A plain dict at runtime, so executors and callbacks can keep returning
+    dict literals; this only names the keys the server reads.
+    """
+
+    result: str
+    intermediate_steps: Sequence[Any]
+    error: str  # Set when the query failed; clients use it to refine GQL
+
+
 class QueryExecutor(Protocol):
     """Protocol for query executors."""
 
-    def execute_query(self, query: str, agent_type: str = "default") -> Dict[str, Any]:
+    def execute_query(self, query: str, agent_type: str = "default") -> QueryResult:
         """
         Execute a query against the database.
 
@@ -91,22 +186,26 @@ class AmbiguityDetector(Protocol):
 
 
 # Default implementations
+# Dummy schema served by DefaultSchemaProvider
+DEFAULT_SCHEMA = """
+        type Query {
+            example: String
+        }
+        """
+
+
 class DefaultSchemaProvider:
     """Default schema provider that returns a dummy schema."""
 
     def get_schema(self, query: str, agent_type: str = "default") -> str:
         """Return a dummy schema for demonstration purposes."""
-        return """
-        type Query {
-            example: String
-        }
-        """
+        return DEFAULT_SCHEMA
 
 
 class DefaultQueryExecutor:
     """Default query executor that returns a dummy result."""
 
-    def execute_query(self, query: str, agent_type: str = "default") -> Dict[str, Any]:
+    def execute_query(self, query: str, agent_type: str = "default") -> QueryResult:
         """Return a dummy result for demonstration purposes."""
         return {"result": f"Dummy result for query: {query}", "intermediate_steps": []}
 
@@ -119,7 +218,54 @@ class DefaultAmbiguityDetector:
         return False
 
 
-@dataclass
+class _CachedSchemaProvider:
+    """
+    LRU cache in front of a schema provider, keyed on (query, agent_type).
+
+    Entries expire after SCHEMA_CACHE_TTL seconds so that providers which
+    reload their schema, such as FileSchemaProvider, are picked up. Other
+    attributes are delegated to the wrapped provider.
+    """
+
+    def __init__(self, provider: SchemaProvider, maxsize: int):
+        self._provider = provider
+        self._maxsize = maxsize
+        # (query, agent_type) -> (monotonic fetch time, schema)
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_schema(self, query: str, agent_type: str = "default") -> str:
+        """Get schema information, calling the wrapped provider on a miss."""
+        key = (query, agent_type)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and now - entry[0] < SCHEMA_CACHE_TTL:
+                self._cache.move_to_end(key)
+                return entry[1]
+
+        schema_info = self._provider.get_schema(query, agent_type)
+        with self._lock:
+            self._cache[key] = (now, schema_info)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self._maxsize:
+                self._cache.popitem(last=False)
+        return schema_info
+
+    def cache_clear(self) -> None:
+        """Drop all cached schema lookups."""
+        with self._lock:
+            self._cache.clear()
+
+    def __getattr__(self, name: str) -> Any:
+        # Guard against recursion before __init__ has set _provider, e.g.
+        # during copy or unpickling
+        if name.startswith("__") or name == "_provider":
+            raise AttributeError(name)
+        return getattr(self._provider, name)
+
+
+@dataclass(slots=True)
 class AppContext:
     """Application context for lifespan management."""
 
@@ -147,11 +293,20 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
 
     if config_path and os.path.exists(config_path):
         try:
-            logger.info(f"Loading configuration from {config_path}")
-            config_dict = toml.load(config_path)
+            logger.info("Loading configuration from %s", config_path)
+            # Imported here so servers configured from the environment never
+            # pay for the TOML parser
+            try:
+                import tomllib
+            except ImportError:  # Python < 3.11
+                import tomli as tomllib
+
+            with open(config_path, "rb") as f:
+                raw = f.read()
+            config_dict = tomllib.loads(raw.decode("utf-8"))
             return config_dict
         except Exception as e:
-            logger.error(f"Error loading configuration from {config_path}: {e}")
+            logger.error("Error loading configuration from %s: %s", config_path, e)
 
     # If no config file or loading failed, use environment variables
     logger.info("Using environment variables for configuration")
@@ -160,11 +315,19 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
         "AGENT_TYPES": os.environ.get("AGENT_TYPES", "default").split(","),
         "PORT": int(os.environ.get("MCP_PORT", "8000")),
         "HOST": os.environ.get("MCP_HOST", "0.0.0.0"),
+        "SCHEMA_CACHE_SIZE": int(os.environ.get("SCHEMA_CACHE_SIZE", "0")),
     }
 
     return config_dict
 
 
+# Patterns used by extract_gql_query, compiled once at import. Both captures
+# start and end on non-whitespace, so matches need no strip().
+_CODE_BLOCK_RE = re.compile(r"```(?:graphql|gql)?\s*([\s\S]*?\S)\s*```")
+_QUERY_RE = re.compile(r"(\{\s*\w+\s*\{[\s\S]+?\}\s*\})")
+_BRACE_RE = re.compile(r"[{}]")
+
+
 def extract_gql_query(text: str) -> str:
     """
     Extract a GraphQL query from text that might contain explanation or other content.
@@ -175,103 +338,97 @@ def extract_gql_query(text: str) -> str:
     Returns:
         The extracted GraphQL query
     """
+    # Fast path: the text is already a bare query
+    stripped = text.strip()
+    if stripped and stripped[0] == "{" and stripped[-1] == "}":
+        return stripped
+
     # Try to extract query between GraphQL code blocks
-    code_block_pattern = r"```(?:graphql|gql)?\s*([\s\S]+?)\s*```"
-    code_match = re.search(code_block_pattern, text)
-    if code_match:
-        return code_match.group(1).strip()
+    if "```" in text:
+        code_match = _CODE_BLOCK_RE.search(text)
+        if code_match:
+            return code_match.group(1)
+
+    # Without an opening brace neither of the remaining strategies can match
+    start = text.find("{")
+    if start < 0:
+        return stripped
 
     # Try to extract query between curly braces if it looks like a GraphQL query
-    query_pattern = r"(\{\s*\w+\s*\{[\s\S]+?\}\s*\})"
-    query_match = re.search(query_pattern, text)
+    query_match = _QUERY_RE.search(text, start)
     if query_match:
-        return query_match.group(1).strip()
-
-    # If no clear pattern matches, return the cleaned text
-    # Remove explanations, leading/trailing text, etc.
-    lines = text.split("\n")
-    query_lines = []
-    in_query = False
-
-    for line in lines:
-        stripped = line.strip()
-        if stripped.startswith("{"):
-            in_query = True
+        return query_match.group(1)
+
+    # If no clear pattern matches, walk from the first opening brace to its
+    # matching closing brace, dropping surrounding explanations
+    depth = 0
+    for brace in _BRACE_RE.finditer(text, start):
+        if brace.group() == "{":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return text[start : brace.end()]
 
-        if in_query:
-            query_lines.append(line)
+    # Last resort: return the original text, assuming it might be a query or fragment
+    return stripped
 
-        if in_query and stripped.endswith("}"):
-            break
 
-    if query_lines:
-        return "\n".join(query_lines)
+async def _notify(hook: Optional[Any], *args: Any) -> None:
+    """
+    Call a Context logging/progress hook, awaiting it if it is async.
 
-    # Last resort: return the original text, assuming it might be a query or fragment
-    return text.strip()
+    Reporting is best-effort: a failure (e.g. no active request) is logged
+    and ignored rather than failing the tool call.
+    """
+    if hook is None:
+        return
+    try:
+        result = hook(*args)
+        if inspect.isawaitable(result):
+            await result
+    except Exception as e:
+        logger.debug("Context notification failed: %s", e)
 
 
 def get_app_context_or_fallback(
     ctx: Context = None, app_context: Optional[AppContext] = None
-) -> Dict[str, Any]:
+) -> AppContext:
     """
     Get application context from the Context object or fall back to provided context.
 
+    The tools registered by create_mcp_server resolve their context inline;
+    this helper is kept for callers that build their own tools.
+
     Args:
         ctx: The Context object provided to the tool
         app_context: Fallback application context
 
     Returns:
-        Dict containing the application context elements
+        The AppContext holding the config, providers and feature flags
     """
+    lifespan_ctx = getattr(ctx, "lifespan_ctx", None)
+    if lifespan_ctx is not None:
+        return lifespan_ctx
+    return _fallback_app_context(ctx, app_context)
+
+
+def _fallback_app_context(
+    ctx: Optional[Context], app_context: Optional[AppContext]
+) -> AppContext:
+    """Cold path of get_app_context_or_fallback: log and return the fallback."""
     if ctx is None:
         logger.warning("Context object is None, using fallback context")
-        if app_context is None:
-            logger.error("No fallback context provided")
-            raise ValueError("No context available")
-
-        return {
-            "config": app_context.config,
-            "schema_provider": app_context.schema_provider,
-            "query_executor": app_context.query_executor,
-            "ambiguity_detector": app_context.ambiguity_detector,
-        }
+    else:
+        logger.warning(
+            "Context object does not have lifespan_ctx attribute, using fallback context"
+        )
 
-    try:
-        if hasattr(ctx, "lifespan_ctx"):
-            logger.debug("Using context.lifespan_ctx")
-            return {
-                "config": ctx.lifespan_ctx.config,
-                "schema_provider": ctx.lifespan_ctx.schema_provider,
-                "query_executor": ctx.lifespan_ctx.query_executor,
-                "ambiguity_detector": ctx.lifespan_ctx.ambiguity_detector,
-            }
-        else:
-            logger.warning(
-                "Context object does not have lifespan_ctx attribute, using fallback context"
-            )
-            if app_context is None:
-                logger.error("No fallback context provided")
-                raise ValueError("No context available")
-
-            return {
-                "config": app_context.config,
-                "schema_provider": app_context.schema_provider,
-                "query_executor": app_context.query_executor,
-                "ambiguity_detector": app_context.ambiguity_detector,
-            }
-    except Exception as e:
-        logger.error(f"Error accessing context: {e}", exc_info=True)
-        if app_context is None:
-            logger.error("No fallback context provided")
-            raise ValueError("No context available")
+    if app_context is None:
+        logger.error("No fallback context provided")
+        raise ValueError("No context available")
 
-        return {
-            "config": app_context.config,
-            "schema_provider": app_context.schema_provider,
-            "query_executor": app_context.query_executor,
-            "ambiguity_detector": app_context.ambiguity_detector,
-        }
+    return app_context
 
 
 def create_mcp_server(
@@ -280,6 +437,8 @@ def create_mcp_server(
     ambiguity_detector: Optional[AmbiguityDetector] = None,
     config_path: Optional[str] = None,
     server_name: str = "TextQL-MCP-Server",
+    config: Optional[Dict[str, Any]] = None,
+    schema_cache_size: Optional[int] = None,
 ) -> FastMCP:
     """
     Create an MCP server with GraphQL query tools.
@@ -290,25 +449,38 @@ def create_mcp_server(
         ambiguity_detector: Detector for query ambiguities
         config_path: Path to the configuration file
         server_name: Name of the MCP server
+        config: Pre-loaded configuration dictionary (skips load_config when given)
+        schema_cache_size: Number of (query, agent_type) schema lookups to cache
+            for SCHEMA_CACHE_TTL seconds; defaults to the SCHEMA_CACHE_SIZE
+            config value, and 0 (the default) disables the cache. Only enable
+            it for providers whose answers do not change within the TTL.
 
     Returns:
         FastMCP: Configured MCP server
     """
-    # Load configuration
-    config = load_config(config_path)
+    # Load configuration unless the caller already provided it
+    if config is None:
+        config = load_config(config_path)
 
     # Initialize feature flags
     feature_flags = FeatureFlagManager(config)
 
     # Use provided components or defaults
     _schema_provider = schema_provider or DefaultSchemaProvider()
+    if schema_cache_size is None:
+        schema_cache_size = int(config.get("SCHEMA_CACHE_SIZE", 0))
+    _cached_schema_provider = (
+        _CachedSchemaProvider(_schema_provider, schema_cache_size)
+        if schema_cache_size > 0
+        else _schema_provider
+    )
     _query_executor = query_executor or DefaultQueryExecutor()
     _ambiguity_detector = ambiguity_detector or DefaultAmbiguityDetector()
 
     # Create application context
     app_context = AppContext(
         config=config,
-        schema_provider=_schema_provider,
+        schema_provider=_cached_schema_provider,
         query_executor=_query_executor,
         ambiguity_detector=_ambiguity_detector,
         feature_flags=feature_flags,
@@ -320,18 +492,36 @@ def create_mcp_server(
         """Manage application lifecycle with type-safe context."""
         logger.info("Starting application lifecycle...")
         try:
-            # Initialize on startup
+            # Initialize on startup; components that need I/O to get ready can
+            # expose an async_init() coroutine, and these run concurrently
             logger.info("Initializing application components")
+            init_coros = [
+                init()
+                for init in (
+                    getattr(_schema_provider, "async_init", None),
+                    getattr(_query_executor, "async_init", None),
+                    getattr(_ambiguity_detector, "async_init", None),
+                )
+                if init is not None
+            ]
+            if init_coros:
+                await asyncio.gather(*init_coros)
             yield app_context
         except Exception as e:
-            logger.error(f"Error during application initialization: {e}", exc_info=True)
+            logger.error(
+                "Error during application initialization: %s", e, exc_info=True
+            )
             raise
         finally:
-            # Cleanup on shutdown
+            # Cleanup on shutdown; components holding threads or connections
+            # expose a close() method
             logger.info("Application shutting down...")
+            close = getattr(_query_executor, "close", None)
+            if close is not None:
+                close()
 
     # Create MCP server
-    logger.info(f"Creating FastMCP server instance: {server_name}")
+    logger.info("Creating FastMCP server instance: %s", server_name)
     mcp = FastMCP(
         server_name,
         lifespan=app_lifespan,
@@ -339,7 +529,6 @@ def create_mcp_server(
             "mcp>=1.6.0",
             "fastapi>=0.95.0",
             "uvicorn>=0.22.0",
-            "toml",
         ],
     )
 
@@ -354,7 +543,7 @@ def create_mcp_server(
 
     @mcp.tool()
     @feature_flag_required(FeatureFlag.ENABLE_QUERY_GRAPH)
-    def query_graph(
+    async def query_graph(
         gql_query: str, agent_type: str = "default", ctx: Context = None
     ) -> Dict[str, Any]:
         """
@@ -372,36 +561,42 @@ def create_mcp_server(
         Returns:
             Dict containing the query results and metadata
         """
-        logger.info(f"query_graph called with agent_type={agent_type}")
-        logger.debug(f"GraphQL query: {gql_query}")
+        logger.info("query_graph called with agent_type=%s", agent_type)
+        logger.debug("GraphQL query: %s", gql_query)
 
-        # Get the app context
-        app_ctx = get_app_context_or_fallback(ctx, app_context)
+        # Resolve the app context (lifespan context if available, else the closure)
+        src = getattr(ctx, "lifespan_ctx", None) or app_context
 
-        # Progress reporting
-        if ctx:
-            try:
-                ctx.info("Executing GraphQL query")
-                ctx.report_progress(0, 1)
-            except Exception as e:
-                logger.warning(f"Error reporting progress: {e}")
+        # Progress reporting hooks, looked up once per request
+        info = getattr(ctx, "info", None) if ctx else None
+        progress = getattr(ctx, "report_progress", None) if ctx else None
+        await _notify(info, "Executing GraphQL query")
+        await _notify(progress, 0, 1)
 
-        # Execute the query directly (no NL processing)
+        # Execute the query directly (no NL processing). Executors with a
+        # native aexecute_query are awaited; blocking ones run in a worker
+        # thread so concurrent tool calls are not serialized on the event loop.
         logger.info("Executing GraphQL query")
-        result = app_ctx["query_executor"].execute_query(gql_query, agent_type)
+        executor = src.query_executor
+        aexecute_query = getattr(executor, "aexecute_query", None)
+        if inspect.iscoroutinefunction(aexecute_query):
+            result = await aexecute_query(gql_query, agent_type)
+        else:
+            result = await asyncio.to_thread(
+                executor.execute_query, gql_query, agent_type
+            )
 
         # Final progress report
-        if ctx:
-            try:
-                ctx.report_progress(1, 1)
-            except Exception as e:
-                logger.warning(f"Error reporting final progress: {e}")
+        await _notify(progress, 1, 1)
 
         logger.info("query_graph completed execution")
+        # A dict literal with constant keys already compiles to a single
+        # BUILD_CONST_KEY_MAP over a preallocated key tuple, so it is kept as-is.
+        # The default list is only allocated when the executor omitted the key.
         return {
             "gql_query": gql_query,
             "result": result.get("result", ""),
-            "intermediate_steps": result.get("intermediate_steps", []),
+            "intermediate_steps": result.get("intermediate_steps") or [],
             "error": result.get("error", ""),  # Key for client refinement
             "agent_type": agent_type,
         }
@@ -429,34 +624,116 @@ def create_mcp_server(
         Returns:
             Dict containing schema information relevant to the query
         """
-        logger.info(f"get_schema_for_query called with agent_type={agent_type}")
-        logger.debug(f"Query: {query}")
+        logger.info("get_schema_for_query called with agent_type=%s", agent_type)
+        logger.debug("Query: %s", query)
 
         # Safety measure: Remove any triple backticks to prevent parsing issues
-        query = query.replace("```", "")
+        if "```" in query:
+            query = query.replace("```", "")
+
+        # Resolve the app context (lifespan context if available, else the closure)
+        src = getattr(ctx, "lifespan_ctx", None) or app_context
+
+        logger.info("Fetching schema information for query: %s", query)
+        schema_info = src.schema_provider.get_schema(query, agent_type)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Schema info length: %d characters",
+                len(schema_info) if schema_info else 0,
+            )
 
-        # Get the app context
-        app_ctx = get_app_context_or_fallback(ctx, app_context)
+        return {"query": query, "agent_type": agent_type, "schema_info": schema_info}
 
-        logger.info(f"Fetching schema information for query: {query}")
-        schema_info = app_ctx["schema_provider"].get_schema(query, agent_type)
-        logger.debug(
-            f"Schema info length: {len(schema_info) if schema_info else 0} characters"
-        )
+    # Stale-while-revalidate cache for the full-schema resources:
+    # agent_type -> (fetched_at, schema_info)
+    full_schema_cache: Dict[str, Tuple[float, str]] = {}
+    refreshing: Set[str] = set()
+    refresh_lock = threading.Lock()
+
+    def fetch_full_schema(agent_type: str) -> str:
+        """Fetch the complete schema for an agent type and cache it."""
+        # Bypass the lookup cache so refreshes reach the provider
+        schema_info = _schema_provider.get_schema("*", agent_type)
+        if (
+            agent_type in full_schema_cache
+            or len(full_schema_cache) < SCHEMA_CACHE_MAX_ENTRIES
+        ):
+            full_schema_cache[agent_type] = (time.monotonic(), schema_info)
+        return schema_info
+
+    def revalidate_full_schema(agent_type: str) -> None:
+        """Refresh a stale cache entry; runs on a background thread."""
+        try:
+            fetch_full_schema(agent_type)
+        except Exception as e:
+            logger.warning(
+                "Error refreshing schema for agent_type=%s: %s", agent_type, e
+            )
+        finally:
+            with refresh_lock:
+                refreshing.discard(agent_type)
 
-        return {"query": query, "agent_type": agent_type, "schema_info": schema_info}
+    def get_full_schema(agent_type: str) -> str:
+        """
+        Get the complete schema for an agent type.
+
+        Fresh entries are served from the cache. Stale entries are served as-is
+        while a background thread refreshes them; only a cold miss calls the
+        schema provider on the request path.
+        """
+        entry = full_schema_cache.get(agent_type)
+        if entry is None:
+            return fetch_full_schema(agent_type)
+
+        fetched_at, schema_info = entry
+        if time.monotonic() - fetched_at >= SCHEMA_CACHE_TTL:
+            with refresh_lock:
+                start_refresh = agent_type not in refreshing
+                refreshing.add(agent_type)
+            if start_refresh:
+                threading.Thread(
+                    target=revalidate_full_schema, args=(agent_type,), daemon=True
+                ).start()
+        return schema_info
+
+    # Resource responses built from the cached schemas: agent_type -> response.
+    # A response is reused for as long as its schema text is the cached one.
+    schema_responses: Dict[str, Dict[str, Any]] = {}
+
+    def full_schema_response(agent_type: str) -> Dict[str, Any]:
+        """Get the schema resource response for an agent type."""
+        schema_info = get_full_schema(agent_type)
+        response = schema_responses.get(agent_type)
+        if response is None or response["schema_info"] is not schema_info:
+            response = {
+                "agent_type": agent_type,
+                "schema_info": schema_info,
+                "filtered": False,
+            }
+            if agent_type in full_schema_cache:
+                schema_responses[agent_type] = response
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Schema info length: %d characters",
+                len(schema_info) if schema_info else 0,
+            )
+        return response
 
     # Register endpoints
     @mcp.resource("http://localhost/health")
-    def get_health() -> Dict[str, str]:
+    def get_health() -> Dict[str, Any]:
         """
         Get server health status.
 
         Returns:
-            Dict with status and version information
+            Dict with status and version information, plus the number of
+            dropped log records if any were dropped
         """
         logger.debug("Health check requested")
-        return {"status": "healthy", "version": "0.1.0"}
+        dropped = _log_handler.dropped if _log_handler is not None else 0
+        if dropped:
+            return {**_HEALTH, "dropped_log_records": dropped}
+        return _HEALTH
 
     @mcp.resource("http://localhost/schema")
     def get_schema() -> Dict[str, Any]:
@@ -467,17 +744,10 @@ def create_mcp_server(
             Dict containing schema information
         """
         logger.info("get_schema endpoint called")
-        # Access app context
-        _app_context = app_context
 
         # Return complete schema information
         logger.info("Fetching complete schema")
-        schema_info = _app_context.schema_provider.get_schema("*", "default")
-        logger.debug(
-            f"Schema info length: {len(schema_info) if schema_info else 0} characters"
-        )
-
-        return {"agent_type": "default", "schema_info": schema_info, "filtered": False}
+        return full_schema_response("default")
 
     @mcp.resource("http://localhost/schema/{agent_type}")
     def get_agent_schema(agent_type: str) -> Dict[str, Any]:
@@ -490,21 +760,27 @@ def create_mcp_server(
         Returns:
             Dict containing schema information for the specified agent type
         """
-        logger.info(f"get_agent_schema endpoint called for agent_type={agent_type}")
-        # Access app context
-        _app_context = app_context
-
-        logger.info(f"Fetching complete schema for agent_type={agent_type}")
-        schema_info = _app_context.schema_provider.get_schema("*", agent_type)
-        logger.debug(
-            f"Schema info length: {len(schema_info) if schema_info else 0} characters"
-        )
-
-        return {"agent_type": agent_type, "schema_info": schema_info, "filtered": False}
+        logger.info("get_agent_schema endpoint called for agent_type=%s", agent_type)
+        logger.info("Fetching complete schema for agent_type=%s", agent_type)
+        return full_schema_response(agent_type)
 
     return mcp
 
 
+# Phrases in a query result that indicate it failed or came back empty
+_INSUFFICIENT_INDICATORS = (
+    "no results found",
+    "couldn't find",
+    "no data available",
+    "no information",
+    "unable to find",
+    "not in our database",
+)
+_REFINE_RE = re.compile(
+    "|".join(map(re.escape, _INSUFFICIENT_INDICATORS)), re.IGNORECASE
+)
+
+
 def result_needs_refinement(result_data: Dict[str, Any]) -> bool:
     """
     Check if query result needs refinement based on content analysis.
@@ -517,20 +793,10 @@ def result_needs_refinement(result_data: Dict[str, Any]) -> bool:
     """
     logger.debug("Checking if result needs refinement")
     # Check if result contains indicators of failed or insufficient queries
-    insufficient_indicators = [
-        "no results found",
-        "couldn't find",
-        "no data available",
-        "no information",
-        "unable to find",
-        "not in our database",
-    ]
-
-    result_text = result_data.get("result", "").lower()
-    for indicator in insufficient_indicators:
-        if indicator in result_text:
-            logger.debug(f"Found refinement indicator: '{indicator}'")
-            return True
+    match = _REFINE_RE.search(result_data.get("result", ""))
+    if match:
+        logger.debug("Found refinement indicator: '%s'", match.group(0).lower())
+        return True
 
     return False
 
@@ -546,5 +812,5 @@ def run_server(mcp: FastMCP) -> None:
         logger.info("Starting MCP server")
         mcp.run()
     except Exception as e:
-        logger.error(f"Error starting server: {e}", exc_info=True)
+        logger.error("Error starting server: %s", e, exc_info=True)
         sys.exit(1)
@@ -3,7 +3,7 @@ Spanner-specific MCP server creation function.
 """
 
 import logging
-from typing import Optional, Any
+from typing import Optional, Any, Dict
 
 from .core.server import (
     create_mcp_server,
@@ -12,7 +12,7 @@ from .core.server import (
 )
 from .utils.schema_provider import SpannerSchemaProvider
 from .utils.query_executor import SpannerQueryExecutor
-from .utils.ambiguity_detector import SimpleAmbiguityDetector
+from .utils.ambiguity_detector import default_simple_detector
 
 logger = logging.getLogger("textql_mcp")
 
@@ -26,6 +26,7 @@ def create_mcp_server_with_spanner(
     server_name: str = "TextQL-MCP-Spanner-Server",
     spanner_project_id: Optional[str] = None,
     graph_name: str = "wikidata_graph",
+    config: Optional[Dict[str, Any]] = None,
 ) -> Any:  # Return type is actually FastMCP but avoid import cycles
     """
     Creates an MCP server configured to use Google Spanner as the backend.
@@ -40,11 +41,12 @@ def create_mcp_server_with_spanner(
         server_name: Name of the MCP server.
         spanner_project_id: Google Cloud project ID for Spanner (defaults to ADC).
         graph_name: Name of the graph in Spanner.
+        config: Pre-loaded configuration dictionary (skips loading config_path).
 
     Returns:
         Configured FastMCP server instance.
     """
-    logger.info(f"Creating MCP server with Spanner integration: {server_name}")
+    logger.info("Creating MCP server with Spanner integration: %s", server_name)
 
     # Initialize Spanner Query Executor
     spanner_executor = SpannerQueryExecutor(
@@ -63,10 +65,14 @@ def create_mcp_server_with_spanner(
             database_id=database_id,
             project_id=spanner_project_id,
             graph_name=graph_name,
+            # Share the executor's client and database rather than opening a
+            # second channel and session pool
+            spanner_client=spanner_executor.spanner_client,
+            database_factory=spanner_executor._get_database,
         )
 
     if ambiguity_detector is None:
-        ambiguity_detector = SimpleAmbiguityDetector()
+        ambiguity_detector = default_simple_detector()
 
     # Create the MCP Server
     return create_mcp_server(
@@ -75,4 +81,5 @@ def create_mcp_server_with_spanner(
         ambiguity_detector=ambiguity_detector,
         config_path=config_path,
         server_name=server_name,
+        config=config,
     )
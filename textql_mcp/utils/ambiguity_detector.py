@@ -5,41 +5,88 @@ This module provides various implementations of ambiguity detectors that
 can be used with the TextQL MCP Server.
 """
 
+import abc
+import asyncio
+import functools
+import inspect
 import logging
 import re
-from typing import Optional, List, Callable
+import threading
+from collections import OrderedDict, namedtuple
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    FrozenSet,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 logger = logging.getLogger("textql_mcp.ambiguity_detector")
 
+# Numbered or named backreferences and conditional group references, which
+# break when patterns are joined
+_BACKREFERENCE_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
 
-class SimpleAmbiguityDetector:
-    """Ambiguity detector that uses simple rules to detect ambiguous queries."""
+# Matches a query with at least three whitespace-separated words
+_MIN_WORDS_RE = re.compile(r"\s*\S+\s+\S+\s+\S")
 
-    def __init__(self, ambiguous_keywords: Optional[List[str]] = None):
-        """
-        Initialize a SimpleAmbiguityDetector.
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
 
-        Args:
-            ambiguous_keywords: List of keywords that indicate ambiguity
-        """
-        self.ambiguous_keywords = set(
-            ambiguous_keywords
-            or [
-                "what",
-                "which",
-                "how many",
-                "how much",
-                "any",
-                "all",
-                "can you",
-                "could you",
-                "would you",
-                "should you",
-            ]
-        )
-        logger.info(
-            f"Initialized SimpleAmbiguityDetector with {len(self.ambiguous_keywords)} keywords"
-        )
+
+class _ResultCacheMixin(abc.ABC):
+    """
+    Thread-safe LRU cache of is_ambiguous results, keyed on the query string.
+
+    Detectors implement _check_uncached() and call _init_cache() from their
+    constructor; a cache_size of 0 disables caching.
+    """
+
+    __slots__ = (
+        "_cache_maxsize",
+        "_cache",
+        "_cache_lock",
+        "_cache_hits",
+        "_cache_misses",
+    )
+
+    def _init_cache(self, cache_size: int) -> None:
+        self._cache_maxsize = cache_size
+        self._cache: "OrderedDict[str, bool]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    @abc.abstractmethod
+    def _check_uncached(self, query: str) -> bool:
+        """Check whether a query is ambiguous, without consulting the cache."""
+
+    def _cache_get(self, query: str) -> Optional[bool]:
+        """Return the cached result for a query, or None on a miss."""
+        if self._cache_maxsize <= 0:
+            return None
+
+        with self._cache_lock:
+            result = self._cache.get(query)
+            if result is not None:
+                self._cache.move_to_end(query)
+                self._cache_hits += 1
+                return result
+            self._cache_misses += 1
+        return None
+
+    def _cache_put(self, query: str, result: bool) -> None:
+        """Store a result, evicting the least recently used entry if full."""
+        if self._cache_maxsize <= 0:
+            return
+
+        with self._cache_lock:
+            self._cache[query] = result
+            if len(self._cache) > self._cache_maxsize:
+                self._cache.popitem(last=False)
 
     def is_ambiguous(self, query: str) -> bool:
         """
@@ -51,83 +98,312 @@ class SimpleAmbiguityDetector:
         Returns:
             True if the query is ambiguous, False otherwise
         """
-        # Convert to lowercase for case-insensitive matching
-        query_lower = query.lower()
+        result = self._cache_get(query)
+        if result is None:
+            result = self._check_uncached(query)
+            self._cache_put(query, result)
+        return result
+
+    def cache_info(self) -> CacheInfo:
+        """Return hit/miss statistics for the result cache."""
+        with self._cache_lock:
+            return CacheInfo(
+                self._cache_hits,
+                self._cache_misses,
+                self._cache_maxsize,
+                len(self._cache),
+            )
+
+    def cache_clear(self) -> None:
+        """Clear the result cache and its statistics."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_hits = 0
+            self._cache_misses = 0
+
+
+# Keyword sets larger than this use an Aho-Corasick automaton when the
+# optional pyahocorasick package is installed; smaller sets do not amortize
+# building one, and a per-keyword bytes scan stops paying off beyond it
+AHO_CORASICK_MIN_KEYWORDS = 32
+
+
+def _build_automaton(keywords: Sequence[str]) -> Optional[Any]:
+    """Build an Aho-Corasick automaton over the lowercased keywords, if possible."""
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword.lower(), keyword.lower())
+    automaton.make_automaton()
+    return automaton
+
+
+def _build_keyword_matchers(
+    keywords: FrozenSet[str],
+) -> Tuple[re.Pattern, Optional[Tuple[bytes, ...]], Optional[Any]]:
+    """
+    Build the matchers SimpleAmbiguityDetector uses for a keyword set.
+
+    Returns a case-insensitive alternation of all keywords; the lowercased
+    keywords as ASCII bytes for the fast path on ASCII queries (None when any
+    keyword is non-ASCII or the set is large); and, for large sets, an
+    Aho-Corasick automaton when pyahocorasick is available. Longer keywords
+    come first so the reported match is the most specific one.
+    """
+    ordered = sorted(keywords, key=lambda keyword: (-len(keyword), keyword))
+    keyword_re = re.compile("|".join(map(re.escape, ordered)), re.IGNORECASE)
+    if len(ordered) > AHO_CORASICK_MIN_KEYWORDS:
+        return keyword_re, None, _build_automaton(ordered)
+
+    keyword_bytes = (
+        tuple(keyword.lower().encode("ascii") for keyword in ordered)
+        if all(keyword.isascii() for keyword in ordered)
+        else None
+    )
+    return keyword_re, keyword_bytes, None
+
+
+class SimpleAmbiguityDetector(_ResultCacheMixin):
+    """Ambiguity detector that uses simple rules to detect ambiguous queries."""
+
+    __slots__ = ("ambiguous_keywords", "_keyword_re", "_keyword_bytes", "_automaton")
+
+    _DEFAULT_KEYWORDS = frozenset(
+        {
+            "what",
+            "which",
+            "how many",
+            "how much",
+            "any",
+            "all",
+            "can you",
+            "could you",
+            "would you",
+            "should you",
+        }
+    )
+    # Matchers for the default keywords, shared by every default detector
+    _DEFAULT_MATCHERS = _build_keyword_matchers(_DEFAULT_KEYWORDS)
+
+    def __init__(
+        self, ambiguous_keywords: Optional[List[str]] = None, cache_size: int = 4096
+    ):
+        """
+        Initialize a SimpleAmbiguityDetector.
+
+        Args:
+            ambiguous_keywords: List of keywords that indicate ambiguity
+            cache_size: Number of query results to cache (0 disables caching)
+        """
+        if ambiguous_keywords:
+            self.ambiguous_keywords = frozenset(ambiguous_keywords)
+            matchers = _build_keyword_matchers(self.ambiguous_keywords)
+        else:
+            self.ambiguous_keywords = self._DEFAULT_KEYWORDS
+            matchers = self._DEFAULT_MATCHERS
+        # Large keyword sets use the automaton when there is one. Otherwise
+        # ASCII queries are matched with bytes containment on the lowercased
+        # encoding, which avoids the Unicode-aware regex machinery, and
+        # anything else goes through the case-insensitive alternation.
+        self._keyword_re, self._keyword_bytes, self._automaton = matchers
+        self._init_cache(cache_size)
+        logger.info(
+            "Initialized SimpleAmbiguityDetector with %d keywords",
+            len(self.ambiguous_keywords),
+        )
 
-        # Check for ambiguous keywords
-        for keyword in self.ambiguous_keywords:
-            if keyword in query_lower:
-                logger.debug(f"Query contains ambiguous keyword: {keyword}")
+    def _check_uncached(self, query: str) -> bool:
+        """Check a query against the rules without consulting the cache."""
+        # Check for ambiguous keywords (case-insensitive)
+        if self._automaton is not None:
+            for _, keyword in self._automaton.iter(query.lower()):
+                logger.debug("Query contains ambiguous keyword: %s", keyword)
+                return True
+        elif self._keyword_bytes is not None and query.isascii():
+            query_bytes = query.encode("ascii").lower()
+            for keyword in self._keyword_bytes:
+                if keyword in query_bytes:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            "Query contains ambiguous keyword: %s",
+                            keyword.decode("ascii"),
+                        )
+                    return True
+        else:
+            match = self._keyword_re.search(query)
+            if match:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Query contains ambiguous keyword: %s", match.group(0).lower()
+                    )
                 return True
 
-        # Check for very short queries (potentially ambiguous)
-        words = query_lower.split()
-        if len(words) < 3:
-            logger.debug(f"Query is too short: {len(words)} words")
+        # Check for very short queries (potentially ambiguous); an anchored
+        # match for three words avoids building a list of tokens
+        if _MIN_WORDS_RE.match(query) is None:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Query is too short: %d words", len(query.split()))
             return True
 
         return False
 
 
-class RegexAmbiguityDetector:
+@functools.lru_cache(maxsize=None)
+def default_simple_detector() -> SimpleAmbiguityDetector:
+    """
+    Return the process-wide SimpleAmbiguityDetector with default keywords.
+
+    The detector holds no per-server state beyond its thread-safe result
+    cache, so server factories share one instance instead of building their
+    own.
+    """
+    return SimpleAmbiguityDetector()
+
+
+def _combine_patterns(patterns: Sequence[str]) -> Optional[re.Pattern]:
+    """
+    Join regex patterns into one alternation so a query is scanned once.
+
+    Returns None when the patterns cannot be combined safely, e.g. when one
+    uses backreferences or conditional groups whose group numbers would
+    shift in the union.
+    """
+    if any(_BACKREFERENCE_RE.search(pattern) for pattern in patterns):
+        return None
+    try:
+        return re.compile(
+            "|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE
+        )
+    except re.error:
+        return None
+
+
+class RegexAmbiguityDetector(_ResultCacheMixin):
     """Ambiguity detector that uses regular expressions to detect ambiguous queries."""
 
-    def __init__(self, ambiguous_patterns: Optional[List[str]] = None):
+    __slots__ = ("ambiguous_patterns", "compiled_patterns", "_combined_re")
+
+    _DEFAULT_PATTERNS = (
+        r"^(what|which|how|who|when|where)",
+        r"\b(any|all|some|few|many|much)\b",
+        r"\b(can|could|would|should)\b.*\?",
+        r"^[^.!?]{1,20}$",  # Very short queries
+    )
+    # Compiled default patterns, shared by every default detector
+    _DEFAULT_COMPILED = tuple(re.compile(p, re.IGNORECASE) for p in _DEFAULT_PATTERNS)
+    _DEFAULT_COMBINED = _combine_patterns(_DEFAULT_PATTERNS)
+
+    def __init__(
+        self, ambiguous_patterns: Optional[List[str]] = None, cache_size: int = 4096
+    ):
         """
         Initialize a RegexAmbiguityDetector.
 
         Args:
             ambiguous_patterns: List of regex patterns that indicate ambiguity
+            cache_size: Number of query results to cache (0 disables caching)
         """
-        self.ambiguous_patterns = ambiguous_patterns or [
-            r"^(what|which|how|who|when|where)",
-            r"\b(any|all|some|few|many|much)\b",
-            r"\b(can|could|would|should)\b.*\?",
-            r"^[^.!?]{1,20}$",  # Very short queries
-        ]
-        self.compiled_patterns = [
-            re.compile(pattern, re.IGNORECASE) for pattern in self.ambiguous_patterns
-        ]
+        if ambiguous_patterns:
+            self.ambiguous_patterns = ambiguous_patterns
+            self.compiled_patterns = [
+                re.compile(pattern, re.IGNORECASE) for pattern in ambiguous_patterns
+            ]
+            self._combined_re = _combine_patterns(ambiguous_patterns)
+        else:
+            self.ambiguous_patterns = self._DEFAULT_PATTERNS
+            self.compiled_patterns = self._DEFAULT_COMPILED
+            self._combined_re = self._DEFAULT_COMBINED
+        self._init_cache(cache_size)
         logger.info(
-            f"Initialized RegexAmbiguityDetector with {len(self.ambiguous_patterns)} patterns"
+            "Initialized RegexAmbiguityDetector with %d patterns",
+            len(self.ambiguous_patterns),
         )
 
-    def is_ambiguous(self, query: str) -> bool:
-        """
-        Check if a query is ambiguous.
-
-        Args:
-            query: The query to check
+    def _check_uncached(self, query: str) -> bool:
+        """Check a query against the rules without consulting the cache."""
+        if self._combined_re is not None:
+            if self._combined_re.search(query) is None:
+                return False
+            if not logger.isEnabledFor(logging.DEBUG):
+                return True
 
-        Returns:
-            True if the query is ambiguous, False otherwise
-        """
+        # Per-pattern scan: the fallback when the patterns could not be
+        # combined, and otherwise only used to report which pattern matched
         for i, pattern in enumerate(self.compiled_patterns):
             if pattern.search(query):
                 logger.debug(
-                    f"Query matches ambiguous pattern: {self.ambiguous_patterns[i]}"
+                    "Query matches ambiguous pattern: %s", self.ambiguous_patterns[i]
                 )
                 return True
 
         return False
 
 
-class CallbackAmbiguityDetector:
+class CallbackAmbiguityDetector(_ResultCacheMixin):
     """Ambiguity detector that uses a callback function to detect ambiguous queries."""
 
-    def __init__(self, callback: Callable[[str], bool]):
+    __slots__ = ("callback", "batch_callback", "_callback_is_async")
+
+    def __init__(
+        self,
+        callback: Callable[[str], Union[bool, Awaitable[bool]]],
+        cache_size: int = 0,
+        batch_callback: Optional[Callable[[List[str]], List[bool]]] = None,
+    ):
         """
         Initialize a CallbackAmbiguityDetector.
 
         Args:
-            callback: Function that checks if a query is ambiguous
+            callback: Function that checks if a query is ambiguous; may be a
+                coroutine function
+            cache_size: Number of query results to cache; off by default since
+                the callback may not be deterministic
+            batch_callback: Optional function that checks several queries in
+                one call, used by is_ambiguous_batch
         """
         self.callback = callback
+        self.batch_callback = batch_callback
+        self._callback_is_async = inspect.iscoroutinefunction(callback)
+        self._init_cache(cache_size)
         logger.info("Initialized CallbackAmbiguityDetector")
 
-    def is_ambiguous(self, query: str) -> bool:
+    def _check_uncached(self, query: str) -> bool:
+        """Check a query with the callback without consulting the cache."""
+        try:
+            if self._callback_is_async:
+                # Only works outside a running event loop; async code should
+                # use is_ambiguous_async instead
+                coro = self.callback(query)
+                try:
+                    return asyncio.run(coro)
+                finally:
+                    coro.close()
+            result = self.callback(query)
+            return result
+        except Exception as e:
+            logger.error("Error checking ambiguity: %s", e)
+            return True  # Assume ambiguous if error
+
+    async def _check_uncached_async(self, query: str) -> bool:
+        """Check a query without blocking the event loop."""
+        try:
+            if self._callback_is_async:
+                return await self.callback(query)
+            return await asyncio.to_thread(self.callback, query)
+        except Exception as e:
+            logger.error("Error checking ambiguity: %s", e)
+            return True  # Assume ambiguous if error
+
+    async def is_ambiguous_async(self, query: str) -> bool:
         """
-        Check if a query is ambiguous.
+        Check if a query is ambiguous from async code.
+
+        Coroutine callbacks are awaited; blocking callbacks run in a worker
+        thread so they do not stall the event loop.
 
         Args:
             query: The query to check
@@ -135,9 +411,62 @@ class CallbackAmbiguityDetector:
         Returns:
             True if the query is ambiguous, False otherwise
         """
-        try:
-            result = self.callback(query)
-            return result
-        except Exception as e:
-            logger.error(f"Error checking ambiguity: {e}")
-            return True  # Assume ambiguous if error
+        result = self._cache_get(query)
+        if result is None:
+            result = await self._check_uncached_async(query)
+            self._cache_put(query, result)
+        return result
+
+    def is_ambiguous_batch(self, queries: List[str]) -> List[bool]:
+        """
+        Check several queries at once.
+
+        Uncached queries go to batch_callback in a single call when one was
+        given; otherwise coroutine callbacks run concurrently and plain
+        callbacks are called one query at a time.
+
+        Args:
+            queries: The queries to check
+
+        Returns:
+            One result per query, in order
+        """
+        results = [self._cache_get(query) for query in queries]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+
+        pending_queries = [queries[i] for i in pending]
+        if self.batch_callback is not None:
+            try:
+                values = list(self.batch_callback(pending_queries))
+                if len(values) != len(pending_queries):
+                    raise ValueError(
+                        f"batch_callback returned {len(values)} results "
+                        f"for {len(pending_queries)} queries"
+                    )
+            except Exception as e:
+                logger.error("Error checking ambiguity: %s", e)
+                values = [True] * len(pending_queries)  # Assume ambiguous if error
+        elif self._callback_is_async:
+            coro = self._gather_async(pending_queries)
+            try:
+                values = asyncio.run(coro)
+            except Exception as e:
+                coro.close()
+                logger.error("Error checking ambiguity: %s", e)
+                values = [True] * len(pending_queries)  # Assume ambiguous if error
+        else:
+            values = [self._check_uncached(query) for query in pending_queries]
+
+        for i, query, value in zip(pending, pending_queries, values):
+            results[i] = value
+            self._cache_put(query, value)
+        return results
+
+    async def _gather_async(self, queries: List[str]) -> List[bool]:
+        return list(
+            await asyncio.gather(
+                *(self._check_uncached_async(query) for query in queries)
+            )
+        )
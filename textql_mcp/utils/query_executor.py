@@ -5,23 +5,144 @@ This module provides various implementations of query executors that
 can be used with the TextQL MCP Server.
 """
 
+import asyncio
+import concurrent.futures
+import contextvars
+import copy
+import hashlib
+import importlib.util
+import inspect
+import json
 import logging
-from typing import Dict, Any, Optional, Callable
-
-# Import Spanner-related libraries if SpannerQueryExecutor is used
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Callable, Tuple
+
+# Check for the Spanner client library without importing it; grpc and
+# friends are only loaded once a Spanner component is actually created
 try:
-    from google.cloud import spanner
-
-    SPANNER_AVAILABLE = True
+    SPANNER_AVAILABLE = importlib.util.find_spec("google.cloud.spanner") is not None
 except ImportError:
     SPANNER_AVAILABLE = False
 
 logger = logging.getLogger("textql_mcp.query_executor")
 
 
+# Queries that already bound their result size and need no LIMIT appended
+_LIMIT_COUNT_RE = re.compile(r"\b(?:limit|count)\b", re.IGNORECASE)
+
+# Shared empty intermediate_steps value for results that have no steps; a
+# tuple, so no caller can mutate it in place
+_EMPTY_STEPS: Tuple[()] = ()
+
+# Result text returned by DummyQueryExecutor
+_DUMMY_RESULT_TEMPLATE = "This is a dummy result for query: %s..."
+
+# Encoder for result rows; matches json.dumps(..., default=str)
+_ROW_ENCODER = json.JSONEncoder(default=str)
+
+
+# Read queries Spanner can run in a read-only snapshot: SQL and GQL keywords,
+# a parenthesized query, a statement hint, or a leading comment
+_READ_QUERY_RE = re.compile(
+    r"\s*(?:(?:SELECT|GRAPH|WITH|MATCH)\b|\(|@\{|--|/\*|#)", re.IGNORECASE
+)
+_NOT_A_READ_QUERY = (
+    "Only read-only queries are supported; a query must start with "
+    "SELECT, GRAPH, WITH or MATCH"
+)
+
+# Statements that modify data; their results are never cached
+_DML_RE = re.compile(r"\b(?:insert|update|delete|merge)\b", re.IGNORECASE)
+
+
+class _ResultCache:
+    """
+    Thread-safe LRU cache of query results with a time-to-live.
+
+    Keys are (agent_type, blake2b digest of the normalized query). Results
+    are deep-copied on the way in and out so callers cannot mutate entries;
+    results that cannot be copied are simply not cached.
+    """
+
+    __slots__ = ("_maxsize", "_ttl", "_entries", "_lock")
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        # key -> (expiry time, result)
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(query: str, agent_type: str) -> Optional[Tuple[str, bytes]]:
+        """Build the cache key for a query, or None if it must not be cached."""
+        if _DML_RE.search(query):
+            return None
+        normalized = query.strip().rstrip(";").encode()
+        return agent_type, hashlib.blake2b(normalized, digest_size=16).digest()
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[Dict[str, Any]]:
+        """Get a copy of a live cached result."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, result = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(result)
+
+    def put(self, key: Tuple[str, bytes], result: Dict[str, Any]) -> None:
+        """Cache a result unless it reports an error or cannot be copied."""
+        if not isinstance(result, dict) or result.get("error"):
+            return
+        try:
+            entry = (time.monotonic() + self._ttl, copy.deepcopy(result))
+        except Exception as e:
+            # e.g. chain outputs holding clients or locks; the query itself
+            # succeeded, so it is returned uncached rather than failed
+            logger.debug("Not caching result that cannot be copied: %s", e)
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+
+def _encode_rows(results: Any) -> Iterator[str]:
+    """
+    Encode each row of a Spanner result set as a JSON object string.
+
+    Joining the rows with ", " inside brackets gives the same text as
+    json.dumps() over a list of row dicts, without building that list.
+    Field names are read after the first row arrives, since a streamed
+    result set only has its metadata once it starts being consumed.
+    """
+    field_names = None
+    encode = _ROW_ENCODER.encode
+    for row in results:
+        if field_names is None:
+            field_names = tuple(field.name for field in results.fields)
+        yield encode(dict(zip(field_names, row)))
+
+
 class DummyQueryExecutor:
     """Query executor that returns dummy results for testing and demonstration."""
 
+    __slots__ = ()
+
     def __init__(self):
         """Initialize a DummyQueryExecutor."""
         logger.info("Initialized DummyQueryExecutor")
@@ -37,24 +158,39 @@ class DummyQueryExecutor:
         Returns:
             Query results as a dictionary
         """
-        logger.info(f"Executing dummy query for agent_type={agent_type}")
+        logger.info("Executing dummy query for agent_type=%s", agent_type)
         return {
-            "result": f"This is a dummy result for query: {query[:100]}...",
-            "intermediate_steps": [],
+            "result": _DUMMY_RESULT_TEMPLATE % query[:100],
+            "intermediate_steps": _EMPTY_STEPS,
         }
 
 
 class CallbackQueryExecutor:
     """Query executor that uses a callback function to execute queries."""
 
-    def __init__(self, callback: Callable[[str, str], Dict[str, Any]]):
+    __slots__ = ("callback", "_callback_is_async", "_result_cache")
+
+    def __init__(
+        self,
+        callback: Callable[[str, str], Any],
+        cache_size: int = 0,
+        cache_ttl: float = 60.0,
+    ):
         """
         Initialize a CallbackQueryExecutor.
 
         Args:
-            callback: Function that executes queries and returns results
+            callback: Function that executes queries and returns results; may
+                be a coroutine function
+            cache_size: Number of successful results to cache per executor;
+                0 (the default) disables result caching
+            cache_ttl: Seconds a cached result stays valid
         """
         self.callback = callback
+        self._callback_is_async = inspect.iscoroutinefunction(callback)
+        self._result_cache = (
+            _ResultCache(cache_size, cache_ttl) if cache_size > 0 else None
+        )
         logger.info("Initialized CallbackQueryExecutor")
 
     def execute_query(self, query: str, agent_type: str = "default") -> Dict[str, Any]:
@@ -68,15 +204,69 @@ class CallbackQueryExecutor:
         Returns:
             Query results as a dictionary
         """
-        logger.info(f"Executing query via callback for agent_type={agent_type}")
+        logger.info("Executing query via callback for agent_type=%s", agent_type)
+        cache_key = self._result_cache and self._result_cache.key(query, agent_type)
+        if cache_key:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        try:
+            if self._callback_is_async:
+                # Only works outside a running event loop; async code should
+                # use aexecute_query instead
+                coro = self.callback(query, agent_type)
+                try:
+                    result = asyncio.run(coro)
+                finally:
+                    coro.close()
+            else:
+                result = self.callback(query, agent_type)
+            if cache_key:
+                self._result_cache.put(cache_key, result)
+            return result
+        except Exception as e:
+            logger.error("Error executing query: %s", e)
+            return {
+                "result": f"Error executing query: {e}",
+                "intermediate_steps": _EMPTY_STEPS,
+                "error": str(e),
+            }
+
+    async def aexecute_query(
+        self, query: str, agent_type: str = "default"
+    ) -> Dict[str, Any]:
+        """
+        Execute a query without blocking the event loop.
+
+        Coroutine callbacks are awaited; blocking callbacks run in a worker
+        thread.
+
+        Args:
+            query: The query to execute
+            agent_type: The agent type identifier
+
+        Returns:
+            Query results as a dictionary
+        """
+        if not self._callback_is_async:
+            return await asyncio.to_thread(self.execute_query, query, agent_type)
+
+        logger.info("Executing query via callback for agent_type=%s", agent_type)
+        cache_key = self._result_cache and self._result_cache.key(query, agent_type)
+        if cache_key:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                return cached
         try:
-            result = self.callback(query, agent_type)
+            result = await self.callback(query, agent_type)
+            if cache_key:
+                self._result_cache.put(cache_key, result)
             return result
         except Exception as e:
-            logger.error(f"Error executing query: {e}")
+            logger.error("Error executing query: %s", e)
             return {
                 "result": f"Error executing query: {e}",
-                "intermediate_steps": [],
+                "intermediate_steps": _EMPTY_STEPS,
                 "error": str(e),
             }
 
@@ -84,16 +274,54 @@ class CallbackQueryExecutor:
 class LLMQueryExecutor:
     """Query executor that uses an LLM to process queries."""
 
-    def __init__(self, get_llm_chain: Callable[[str], Any]):
+    __slots__ = (
+        "get_llm_chain",
+        "batch_size",
+        "_result_cache",
+        "_chain_cache",
+        "_chain_lock",
+    )
+
+    def __init__(
+        self,
+        get_llm_chain: Callable[[str], Any],
+        batch_size: int = 8,
+        cache_size: int = 0,
+        cache_ttl: float = 60.0,
+    ):
         """
         Initialize an LLMQueryExecutor.
 
         Args:
             get_llm_chain: Function that returns an LLM chain for a given agent type
+            batch_size: Maximum number of queries sent to the chain per batch
+                call in execute_queries(); 1 disables batching
+            cache_size: Number of successful results to cache per executor;
+                0 (the default) disables result caching
+            cache_ttl: Seconds a cached result stays valid
         """
         self.get_llm_chain = get_llm_chain
+        self.batch_size = max(1, batch_size)
+        self._result_cache = (
+            _ResultCache(cache_size, cache_ttl) if cache_size > 0 else None
+        )
+        # Chains built by the factory, one per agent type
+        self._chain_cache: Dict[str, Any] = {}
+        self._chain_lock = threading.Lock()
         logger.info("Initialized LLMQueryExecutor")
 
+    def _get_chain(self, agent_type: str) -> Any:
+        """Get the chain for an agent type, building it on first use."""
+        chain = self._chain_cache.get(agent_type)
+        if chain is None:
+            # The factory may not be reentrant; build each chain exactly once
+            with self._chain_lock:
+                chain = self._chain_cache.get(agent_type)
+                if chain is None:
+                    chain = self.get_llm_chain(agent_type)
+                    self._chain_cache[agent_type] = chain
+        return chain
+
     def execute_query(self, query: str, agent_type: str = "default") -> Dict[str, Any]:
         """
         Execute a query using an LLM chain.
@@ -105,16 +333,123 @@ class LLMQueryExecutor:
         Returns:
             Query results as a dictionary
         """
-        logger.info(f"Executing query via LLM for agent_type={agent_type}")
+        logger.info("Executing query via LLM for agent_type=%s", agent_type)
+        cache_key = self._result_cache and self._result_cache.key(query, agent_type)
+        if cache_key:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                return cached
         try:
-            chain = self.get_llm_chain(agent_type)
+            chain = self._get_chain(agent_type)
             result = chain.invoke(query)
+            if cache_key:
+                self._result_cache.put(cache_key, result)
+            return result
+        except Exception as e:
+            logger.error("Error executing query: %s", e)
+            return {
+                "result": f"Error executing query: {e}",
+                "intermediate_steps": _EMPTY_STEPS,
+                "error": str(e),
+            }
+
+    def execute_queries(
+        self, queries: List[str], agent_type: str = "default"
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute several queries, batch_size at a time.
+
+        Chains with a batch() method (such as LangChain runnables) get each
+        group of queries in one call; other chains are invoked per query.
+        Cached results are reused, and only the remaining queries are sent.
+
+        Args:
+            queries: The queries to execute
+            agent_type: The agent type identifier
+
+        Returns:
+            One result dictionary per query, in order
+        """
+        try:
+            chain = self._get_chain(agent_type)
+        except Exception as e:
+            logger.error("Error executing query: %s", e)
+            return [
+                {
+                    "result": f"Error executing query: {e}",
+                    "intermediate_steps": _EMPTY_STEPS,
+                    "error": str(e),
+                }
+                for _ in queries
+            ]
+
+        batch = getattr(chain, "batch", None)
+        if batch is None or self.batch_size == 1:
+            return [self.execute_query(query, agent_type) for query in queries]
+
+        # Serve what the result cache can, and batch only the misses
+        results: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+        misses: List[Tuple[int, str, Optional[Tuple[str, bytes]]]] = []
+        for index, query in enumerate(queries):
+            cache_key = self._result_cache and self._result_cache.key(query, agent_type)
+            cached = self._result_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                results[index] = cached
+            else:
+                misses.append((index, query, cache_key))
+
+        for start in range(0, len(misses), self.batch_size):
+            group = misses[start : start + self.batch_size]
+            try:
+                outputs = batch([query for _, query, _ in group])
+            except Exception as e:
+                logger.error("Error executing query batch: %s", e)
+                for index, query, _ in group:
+                    results[index] = self.execute_query(query, agent_type)
+                continue
+            for (index, _, cache_key), result in zip(group, outputs):
+                results[index] = result
+                if cache_key:
+                    self._result_cache.put(cache_key, result)
+        return results
+
+    async def aexecute_query(
+        self, query: str, agent_type: str = "default"
+    ) -> Dict[str, Any]:
+        """
+        Execute a query using an LLM chain without blocking the event loop.
+
+        Uses the chain's native ainvoke() when it has one, and otherwise runs
+        invoke() in a worker thread.
+
+        Args:
+            query: The query to execute
+            agent_type: The agent type identifier
+
+        Returns:
+            Query results as a dictionary
+        """
+        logger.info("Executing query via LLM for agent_type=%s", agent_type)
+        cache_key = self._result_cache and self._result_cache.key(query, agent_type)
+        if cache_key:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        try:
+            chain = self._get_chain(agent_type)
+            ainvoke = getattr(chain, "ainvoke", None)
+            if ainvoke is not None and inspect.iscoroutinefunction(ainvoke):
+                result = await ainvoke(query)
+            else:
+                result = await asyncio.to_thread(chain.invoke, query)
+            if cache_key:
+                self._result_cache.put(cache_key, result)
             return result
         except Exception as e:
-            logger.error(f"Error executing query: {e}")
+            logger.error("Error executing query: %s", e)
             return {
                 "result": f"Error executing query: {e}",
-                "intermediate_steps": [],
+                "intermediate_steps": _EMPTY_STEPS,
                 "error": str(e),
             }
 
@@ -126,6 +461,24 @@ class SpannerQueryExecutor:
     any NL processing or translation.
     """
 
+    __slots__ = (
+        "instance_id",
+        "database_id",
+        "project_id",
+        "graph_name",
+        "pool_size",
+        "ping_interval",
+        "spanner_client",
+        "_result_cache",
+        "_database_cache",
+        "_database",
+        "_database_lock",
+        "_ping_stop",
+        "_ping_thread",
+        "_query_pool",
+        "_scoped_snapshot",
+    )
+
     def __init__(
         self,
         instance_id: str,
@@ -133,6 +486,10 @@ class SpannerQueryExecutor:
         project_id: Optional[str] = None,
         spanner_client: Optional[Any] = None,
         graph_name: str = "wikidata_graph",
+        pool_size: int = 10,
+        ping_interval: int = 300,
+        cache_size: int = 0,
+        cache_ttl: float = 60.0,
     ):
         """
         Initialize a SpannerQueryExecutor.
@@ -143,6 +500,12 @@ class SpannerQueryExecutor:
             project_id: Google Cloud project ID (optional, defaults to ADC).
             spanner_client: Optional pre-configured Spanner client.
             graph_name: Name of the graph in Spanner.
+            pool_size: Number of pre-created Spanner sessions kept warm by a
+                PingingPool; 0 uses the client's default session pool.
+            ping_interval: Seconds between keep-alive pings of idle sessions.
+            cache_size: Number of successful query results to cache; 0 (the
+                default) disables result caching.
+            cache_ttl: Seconds a cached result stays valid.
         """
         if not SPANNER_AVAILABLE:
             raise ImportError(
@@ -157,106 +520,394 @@ class SpannerQueryExecutor:
         self.database_id = database_id
         self.project_id = project_id
         self.graph_name = graph_name
+        self.pool_size = pool_size
+        self.ping_interval = ping_interval
+        self._result_cache = (
+            _ResultCache(cache_size, cache_ttl) if cache_size > 0 else None
+        )
 
         # Initialize Google Spanner client
         try:
-            self.spanner_client = spanner_client or spanner.Client(
-                project=self.project_id
-            )
+            if spanner_client is None:
+                from google.cloud import spanner
+
+                spanner_client = spanner.Client(project=self.project_id)
+            self.spanner_client = spanner_client
             logger.info(
-                f"Initialized SpannerQueryExecutor for instance='{instance_id}', "
-                f"database='{database_id}'"
+                "Initialized SpannerQueryExecutor for instance='%s', database='%s'",
+                instance_id,
+                database_id,
             )
         except Exception as e:
-            logger.error(f"Failed to initialize Spanner client: {e}", exc_info=True)
+            logger.error("Failed to initialize Spanner client: %s", e, exc_info=True)
             raise RuntimeError(f"Spanner client initialization failed: {e}") from e
 
-        # Cache for database instances per agent type to avoid re-initialization
+        # Cache for database instances per agent type to avoid re-initialization.
+        # All agent types share one database handle, and with it one pool.
         self._database_cache = {}
+        self._database = None
+        self._database_lock = threading.Lock()
+        self._ping_stop = threading.Event()
+        self._ping_thread: Optional[threading.Thread] = None
+        self._query_pool = self._new_query_pool()
+        # Multi-use snapshot opened by read_scope(), with a lock serializing
+        # its use by calls running concurrently inside the same scope
+        self._scoped_snapshot: contextvars.ContextVar[
+            Optional[Tuple[Any, threading.Lock]]
+        ] = contextvars.ContextVar(f"spanner_snapshot_{id(self)}", default=None)
+
+    def _new_query_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Worker threads for aexecute_query, started lazily on first submit."""
+        # One worker per pooled session so threads never wait on sessions;
+        # a pool_size of 0 falls back to the default worker count
+        return concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.pool_size or None, thread_name_prefix="spanner-qx"
+        )
+
+    async def async_init(self) -> None:
+        """
+        Open the database at server startup, off the event loop.
+
+        Binding the PingingPool creates all of its sessions, so doing it here
+        keeps that cost out of the first query.
+        """
+        await asyncio.to_thread(self._get_database)
 
     def _get_database(self, agent_type: str = "default") -> Any:
         """Gets or initializes the Spanner database instance."""
         if agent_type not in self._database_cache:
             try:
                 logger.info(
-                    f"Initializing Spanner database for instance='{self.instance_id}', "
-                    f"database='{self.database_id}'"
+                    "Initializing Spanner database for instance='%s', database='%s'",
+                    self.instance_id,
+                    self.database_id,
                 )
 
-                # Get instance and database
-                instance = self.spanner_client.instance(self.instance_id)
-                database = instance.database(self.database_id)
-
-                self._database_cache[agent_type] = database
+                self._database_cache[agent_type] = self._open_database()
             except Exception as e:
                 logger.error(
-                    f"Failed to initialize Spanner database: {e}",
-                    exc_info=True,
+                    "Failed to initialize Spanner database: %s", e, exc_info=True
                 )
                 raise RuntimeError(
                     f"Spanner database initialization failed: {e}"
                 ) from e
         return self._database_cache[agent_type]
 
-    def execute_query(self, query: str, agent_type: str = "default") -> Dict[str, Any]:
+    def _open_database(self) -> Any:
+        """
+        Open the database handle, backed by a PingingPool.
+
+        Creating the database binds the pool, which creates all of its sessions
+        up front; async_init() does this at server startup so queries do not
+        pay for session creation. A daemon thread then pings idle sessions so
+        they are not expired server-side.
+        """
+        with self._database_lock:
+            if self._database is not None:
+                return self._database
+
+            instance = self.spanner_client.instance(self.instance_id)
+            if self.pool_size > 0:
+                from google.cloud.spanner_v1.pool import PingingPool
+
+                pool = PingingPool(
+                    size=self.pool_size,
+                    default_timeout=5,
+                    ping_interval=self.ping_interval,
+                )
+                database = instance.database(self.database_id, pool=pool)
+                self._ping_thread = threading.Thread(
+                    target=self._ping_sessions,
+                    args=(pool, self._ping_stop),
+                    name="spanner-session-ping",
+                    daemon=True,
+                )
+                self._ping_thread.start()
+            else:
+                database = instance.database(self.database_id)
+
+            self._database = database
+            return database
+
+    def _ping_sessions(self, pool: Any, stop: threading.Event) -> None:
+        """Keep pooled sessions alive until close() is called."""
+        interval = max(1, self.ping_interval // 2)
+        while not stop.wait(interval):
+            try:
+                pool.ping()
+            except Exception as e:
+                logger.warning("Spanner session ping failed: %s", e)
+
+    def close(self) -> None:
+        """
+        Stop background session maintenance and the query worker threads.
+
+        The executor stays usable: the server lifespan runs once per client
+        session, so a later query reopens the database and its workers.
+        Queries already submitted are allowed to finish.
+        """
+        with self._database_lock:
+            self._ping_stop.set()
+            self._ping_stop = threading.Event()
+            ping_thread, self._ping_thread = self._ping_thread, None
+            query_pool, self._query_pool = self._query_pool, self._new_query_pool()
+            self._database = None
+            self._database_cache = {}
+        if ping_thread is not None:
+            ping_thread.join(timeout=1)
+        query_pool.shutdown(wait=False)
+
+    @staticmethod
+    def _bound_query(query: str, limit: str = "100") -> str:
+        """Append a LIMIT to queries that do not already bound their results."""
+        if not _LIMIT_COUNT_RE.search(query):
+            # Drop trailing whitespace and semicolons in a single pass
+            query = query.rstrip("; \t\r\n") + " LIMIT " + limit
+        return query
+
+    @staticmethod
+    def _run_query(
+        snapshot: Any,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        param_types: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Run one query on an open snapshot, encoding rows as they stream in."""
+        if params is None:
+            results = snapshot.execute_sql(query)
+        else:
+            results = snapshot.execute_sql(
+                query, params=params, param_types=param_types
+            )
+        encoded_rows = ", ".join(_encode_rows(results))
+        return {
+            "result": f"[{encoded_rows}]",
+            "intermediate_steps": _EMPTY_STEPS,
+        }
+
+    @contextmanager
+    def read_scope(self, agent_type: str = "default") -> Iterator[Any]:
+        """
+        Share one multi-use read-only snapshot across the queries in a block.
+
+        Queries run through execute_query() or aexecute_query() inside the
+        block reuse the snapshot's session and read transaction instead of
+        beginning a single-use transaction each. The snapshot is closed and
+        its session returned to the pool when the block exits. Nested scopes
+        reuse the outermost snapshot.
+
+        Args:
+            agent_type: The agent type identifier
+
+        Yields:
+            The open snapshot
+        """
+        scoped = self._scoped_snapshot.get()
+        if scoped is not None:
+            yield scoped[0]
+            return
+
+        database = self._get_database(agent_type)
+        with database.snapshot(multi_use=True) as snapshot:
+            token = self._scoped_snapshot.set((snapshot, threading.Lock()))
+            try:
+                yield snapshot
+            finally:
+                self._scoped_snapshot.reset(token)
+
+    def execute_query(
+        self,
+        query: str,
+        agent_type: str = "default",
+        params: Optional[Dict[str, Any]] = None,
+        param_types: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
         """
         Execute a GQL query directly against the Spanner graph.
 
+        Queries that are run repeatedly with different values should use
+        @name placeholders and pass the values in params, so that Spanner can
+        reuse the cached plan instead of compiling each literal variant.
+
         Args:
             query: The GQL query string to execute
             agent_type: The agent type identifier
+            params: Values for the query's @name placeholders (optional)
+            param_types: Spanner types for the values in params (optional)
 
         Returns:
             Query results as a dictionary containing 'result' and 'error' keys
         """
-        logger.info(f"Executing direct Spanner SQL for agent_type='{agent_type}'")
-        logger.debug(f"SQL query: {query[:200]}...")
+        logger.info("Executing direct Spanner SQL for agent_type='%s'", agent_type)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("SQL query: %.200s...", query)
+
+        # Reject queries that cannot succeed before they take a session
+        if _READ_QUERY_RE.match(query) is None:
+            logger.warning("Rejected query for agent_type='%s'", agent_type)
+            return {
+                "result": "",
+                "intermediate_steps": _EMPTY_STEPS,
+                "error": _NOT_A_READ_QUERY,
+            }
+
+        # Parameterized results depend on the values, which are not in the key
+        cache_key = (
+            params is None
+            and self._result_cache
+            and self._result_cache.key(query, agent_type)
+        )
+        if cache_key:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Returning cached result for agent_type='%s'", agent_type)
+                return cached
 
         try:
             # Get the database instance
             database = self._get_database(agent_type)
 
-            # Add LIMIT if not present (for safety)
-            query_lower = query.lower()
-            if "limit" not in query_lower and "count" not in query_lower:
-                query = query.strip()
-                if query.endswith(";"):
-                    query = query[:-1]
-                query += " LIMIT 100"
-
-            logger.info(f"Executing SQL query: {query}")
-
-            # Execute the query using a snapshot for read-only access
-            raw_results = []
-            with database.snapshot() as snapshot:
-                results = snapshot.execute_sql(query)
-                # Convert results to list of dictionaries
-                for row in results:
-                    # Convert Row to dict
-                    row_dict = {}
-                    for idx, field in enumerate(results.fields):
-                        row_dict[field.name] = row[idx]
-                    raw_results.append(row_dict)
-
-            # Format results
-            import json
-
-            result_data = {
-                "result": json.dumps(raw_results, default=str),
-                "intermediate_steps": [],
-            }
-
-            logger.info(f"Query execution successful for agent_type='{agent_type}'")
-            logger.debug(f"Result: {str(result_data)[:200]}...")
+            # Add LIMIT if not present (for safety); parameterized queries get
+            # it as a parameter too, so their text stays the same
+            if params is None:
+                query = self._bound_query(query)
+            elif not _LIMIT_COUNT_RE.search(query):
+                from google.cloud.spanner_v1 import param_types as spanner_types
+
+                query = self._bound_query(query, "@_limit")
+                params = {**params, "_limit": 100}
+                param_types = {**(param_types or {}), "_limit": spanner_types.INT64}
+
+            logger.info("Executing SQL query: %s", query)
+
+            # Execute the query using a snapshot for read-only access, reusing
+            # the one opened by an enclosing read_scope() if there is one
+            scoped = self._scoped_snapshot.get()
+            if scoped is not None:
+                snapshot, lock = scoped
+                with lock:
+                    result_data = self._run_query(snapshot, query, params, param_types)
+            else:
+                with database.snapshot() as snapshot:
+                    result_data = self._run_query(snapshot, query, params, param_types)
+
+            if cache_key:
+                self._result_cache.put(cache_key, result_data)
+
+            logger.info("Query execution successful for agent_type='%s'", agent_type)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Result: %.200s...", result_data)
             return result_data
 
         except Exception as e:
             logger.error(
-                f"SQL execution failed for agent_type '{agent_type}': {e}",
+                "SQL execution failed for agent_type '%s': %s",
+                agent_type,
+                e,
                 exc_info=True,
             )
             return {
                 "result": "",
-                "intermediate_steps": [],
+                "intermediate_steps": _EMPTY_STEPS,
                 "error": str(e),  # Clients use this to iterate/refine GQL
             }
+
+    def execute_queries(
+        self, queries: List[str], agent_type: str = "default"
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute several GQL queries inside one read-only snapshot.
+
+        All queries share a session and a read timestamp, so a batch costs one
+        session checkout instead of one per query. A failing query only sets
+        the 'error' key of its own result.
+
+        Args:
+            queries: The GQL query strings to execute
+            agent_type: The agent type identifier
+
+        Returns:
+            One result dictionary per query, in order
+        """
+        logger.info(
+            "Executing %d Spanner SQL queries for agent_type='%s'",
+            len(queries),
+            agent_type,
+        )
+        try:
+            database = self._get_database(agent_type)
+        except Exception as e:
+            return [
+                {"result": "", "intermediate_steps": _EMPTY_STEPS, "error": str(e)}
+                for _ in queries
+            ]
+
+        results = []
+        try:
+            with database.snapshot(multi_use=True) as snapshot:
+                for query in queries:
+                    if _READ_QUERY_RE.match(query) is None:
+                        results.append(
+                            {
+                                "result": "",
+                                "intermediate_steps": _EMPTY_STEPS,
+                                "error": _NOT_A_READ_QUERY,
+                            }
+                        )
+                        continue
+                    try:
+                        results.append(
+                            self._run_query(snapshot, self._bound_query(query))
+                        )
+                    except Exception as e:
+                        logger.error("SQL execution failed: %s", e, exc_info=True)
+                        results.append(
+                            {
+                                "result": "",
+                                "intermediate_steps": _EMPTY_STEPS,
+                                "error": str(e),
+                            }
+                        )
+        except Exception as e:
+            logger.error("Spanner snapshot failed: %s", e, exc_info=True)
+            results.extend(
+                {"result": "", "intermediate_steps": _EMPTY_STEPS, "error": str(e)}
+                for _ in queries[len(results) :]
+            )
+        return results
+
+    async def aexecute_query(
+        self,
+        query: str,
+        agent_type: str = "default",
+        params: Optional[Dict[str, Any]] = None,
+        param_types: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Execute a GQL query without blocking the event loop.
+
+        The blocking Spanner call runs on the executor's own thread pool,
+        which is sized to the session pool so threads never wait on sessions.
+
+        Args:
+            query: The GQL query string to execute
+            agent_type: The agent type identifier
+            params: Values for the query's @name placeholders (optional)
+            param_types: Spanner types for the values in params (optional)
+
+        Returns:
+            Query results as a dictionary containing 'result' and 'error' keys
+        """
+        loop = asyncio.get_running_loop()
+        # Run in a copy of the current context so an enclosing read_scope()
+        # is visible to the worker thread
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._query_pool,
+            context.run,
+            self.execute_query,
+            query,
+            agent_type,
+            params,
+            param_types,
+        )
@@ -5,15 +5,18 @@ This module provides various implementations of schema providers that
 can be used with the TextQL MCP Server.
 """
 
+import asyncio
 import os
+import importlib.util
 import logging
-from typing import Dict, Optional
+import threading
+import time
+from typing import Dict, Optional, Tuple
 
-# Import Spanner-related libraries if available
+# Check for the Spanner client library without importing it; grpc and
+# friends are only loaded once a Spanner component is actually created
 try:
-    import google.cloud.spanner  # noqa: F401
-
-    SPANNER_AVAILABLE = True
+    SPANNER_AVAILABLE = importlib.util.find_spec("google.cloud.spanner") is not None
 except ImportError:
     SPANNER_AVAILABLE = False
 
@@ -35,23 +38,108 @@ except ImportError:
 
 
 class FileSchemaProvider:
-    """Schema provider that reads schema from a file."""
+    """
+    Schema provider that reads schema from a file.
+
+    File contents are cached per path and shared by all providers; a file is
+    only read again when its modification time changes. The modification
+    time itself is checked at most once per check_interval seconds.
+    """
+
+    __slots__ = ("schema_file_path", "check_interval", "_path", "_checked_at")
 
-    def __init__(self, schema_file_path: str):
+    # Absolute path -> (mtime in ns, schema)
+    _schema_cache: Dict[str, Tuple[int, str]] = {}
+    _schema_cache_lock = threading.Lock()
+
+    def __init__(self, schema_file_path: str, check_interval: float = 1.0):
         """
         Initialize a FileSchemaProvider.
 
         Args:
             schema_file_path: Path to the GraphQL schema file
+            check_interval: Minimum seconds between checks of the file's
+                modification time; 0 checks on every call
+        """
+        self._setup(schema_file_path, check_interval)
+        self._load()
+
+    @classmethod
+    async def create(
+        cls, schema_file_path: str, check_interval: float = 1.0
+    ) -> "FileSchemaProvider":
         """
+        Create a FileSchemaProvider without blocking the event loop.
+
+        The initial read runs in a worker thread. Outside of async code the
+        plain constructor does the same work synchronously.
+
+        Args:
+            schema_file_path: Path to the GraphQL schema file
+            check_interval: Minimum seconds between checks of the file's
+                modification time; 0 checks on every call
+
+        Returns:
+            The initialized provider
+        """
+        provider = cls.__new__(cls)
+        provider._setup(schema_file_path, check_interval)
+        await asyncio.to_thread(provider._load)
+        return provider
+
+    async def async_init(self) -> None:
+        """
+        Refresh the cached schema at server startup, off the event loop.
+
+        get_schema is called from the event loop, so a file edited since the
+        provider was built is read here rather than by the first request.
+        """
+        self._checked_at = float("-inf")
+        await asyncio.to_thread(self._load)
+
+    def _setup(self, schema_file_path: str, check_interval: float) -> None:
+        """Set the attributes shared by both constructors."""
         self.schema_file_path = schema_file_path
-        if not os.path.exists(schema_file_path):
-            logger.warning(f"Schema file not found: {schema_file_path}")
+        self.check_interval = check_interval
+        self._path = os.path.abspath(schema_file_path)
+        self._checked_at = float("-inf")
+
+    def _load(self) -> None:
+        """Read the file up front so the first request is served from memory."""
+        # The read doubles as the existence check
+        try:
+            self._read_schema()
+        except FileNotFoundError:
+            logger.warning("Schema file not found: %s", self.schema_file_path)
+        except (OSError, UnicodeDecodeError) as e:
+            # get_schema reports the error to callers on each request
+            logger.error("Error reading schema file: %s", e)
         else:
             logger.info(
-                f"Initialized FileSchemaProvider with schema file: {schema_file_path}"
+                "Initialized FileSchemaProvider with schema file: %s",
+                self.schema_file_path,
             )
 
+    def _read_schema(self) -> str:
+        """Return the cached schema, reading the file if it changed."""
+        path = self._path
+        cached = self._schema_cache.get(path)
+        now = time.monotonic()
+        if cached is not None and now - self._checked_at < self.check_interval:
+            return cached[1]
+
+        mtime = os.stat(path).st_mtime_ns
+        self._checked_at = now
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        logger.info("Reading schema from file: %s", self.schema_file_path)
+        with open(path, "r") as f:
+            schema = f.read()
+        with self._schema_cache_lock:
+            self._schema_cache[path] = (mtime, schema)
+        return schema
+
     def get_schema(self, query: str, agent_type: str = "default") -> str:
         """
         Get schema information for a query.
@@ -64,18 +152,17 @@ class FileSchemaProvider:
             Schema information as a string
         """
         try:
-            logger.info(f"Reading schema from file: {self.schema_file_path}")
-            with open(self.schema_file_path, "r") as f:
-                schema = f.read()
-            return schema
+            return self._read_schema()
         except Exception as e:
-            logger.error(f"Error reading schema file: {e}")
+            logger.error("Error reading schema file: %s", e)
             return f"Error: Could not read schema file: {e}"
 
 
 class StringSchemaProvider:
     """Schema provider that uses a predefined schema string."""
 
+    __slots__ = ("schema",)
+
     def __init__(self, schema: str):
         """
         Initialize a StringSchemaProvider.
@@ -103,6 +190,8 @@ class StringSchemaProvider:
 class MultiAgentSchemaProvider:
     """Schema provider that supports multiple agent types with different schemas."""
 
+    __slots__ = ("schemas", "default_schema")
+
     def __init__(self, schemas: Dict[str, str], default_schema: Optional[str] = None):
         """
         Initialize a MultiAgentSchemaProvider.
@@ -114,7 +203,7 @@ class MultiAgentSchemaProvider:
         self.schemas = schemas
         self.default_schema = default_schema or next(iter(schemas.values()), "")
         logger.info(
-            f"Initialized MultiAgentSchemaProvider with {len(schemas)} agent types"
+            "Initialized MultiAgentSchemaProvider with %d agent types", len(schemas)
         )
 
     def get_schema(self, query: str, agent_type: str = "default") -> str:
@@ -131,5 +220,5 @@ class MultiAgentSchemaProvider:
         if agent_type in self.schemas:
             return self.schemas[agent_type]
         else:
-            logger.warning(f"Unknown agent type: {agent_type}, using default schema")
+            logger.warning("Unknown agent type: %s, using default schema", agent_type)
             return self.default_schema
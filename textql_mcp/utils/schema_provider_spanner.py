@@ -2,30 +2,75 @@
 Spanner-specific schema provider implementation for the TextQL MCP Server.
 """
 
+import importlib.util
 import logging
-from typing import Dict, Any, Optional
+import re
+from typing import Callable, Dict, Any, Optional, Set, Tuple
 import json
 
-# Import Spanner-related libraries if available
+# Check for the Spanner client library without importing it; grpc and
+# friends are only loaded once a Spanner component is actually created
 try:
-    from google.cloud import spanner
-
-    SPANNER_AVAILABLE = True
+    SPANNER_AVAILABLE = importlib.util.find_spec("google.cloud.spanner") is not None
 except ImportError:
     SPANNER_AVAILABLE = False
 
 logger = logging.getLogger("textql_mcp.schema_provider")
 
+# Entity and relationship types in the Wikidata graph
+_ENTITY_TYPES = (
+    "Company",
+    "Person",
+    "Location",
+    "Organization",
+    "Educational Institution",
+)
+_RELATIONSHIP_TYPES = (
+    "WORKED_AT",
+    "CITIZEN_OF",
+    "EDUCATED_AT",
+    "MEMBER_OF",
+    "FOUNDER_OF",
+    "SUBSIDIARY_OF",
+    "EMPLOYED_BY",
+)
+_ENTITY_TYPE_SET = frozenset(_ENTITY_TYPES)
+_RELATIONSHIP_TYPE_SET = frozenset(_RELATIONSHIP_TYPES)
+
+# One case-insensitive alternation over every type name, so a query is
+# scanned once rather than once per type; longest names go first
+_TYPE_BY_LOWER = {t.lower(): t for t in (*_ENTITY_TYPES, *_RELATIONSHIP_TYPES)}
+_TYPE_RE = re.compile(
+    r"\b(?:"
+    + "|".join(re.escape(t) for t in sorted(_TYPE_BY_LOWER, key=len, reverse=True))
+    + r")\b",
+    re.IGNORECASE,
+)
+
 
 class SpannerSchemaProvider:
     """Schema provider that retrieves schema information from Google Spanner."""
 
+    __slots__ = (
+        "instance_id",
+        "database_id",
+        "project_id",
+        "graph_name",
+        "_schema_json",
+        "client",
+        "instance",
+        "_database",
+        "_database_factory",
+    )
+
     def __init__(
         self,
         instance_id: str,
         database_id: str,
         project_id: Optional[str] = None,
         graph_name: str = "wikidata_graph",
+        spanner_client: Optional[Any] = None,
+        database_factory: Optional[Callable[[], Any]] = None,
     ):
         """
         Initialize a SpannerSchemaProvider.
@@ -35,6 +80,10 @@ class SpannerSchemaProvider:
             database_id: The Google Spanner database ID
             project_id: Google Cloud project ID (optional, defaults to ADC)
             graph_name: Name of the graph in Spanner
+            spanner_client: Optional pre-configured Spanner client, e.g. one
+                shared with a SpannerQueryExecutor
+            database_factory: Optional callable returning the database handle,
+                e.g. a SpannerQueryExecutor's, so both share one session pool
         """
         if not SPANNER_AVAILABLE:
             raise ImportError(
@@ -46,18 +95,27 @@ class SpannerSchemaProvider:
         self.database_id = database_id
         self.project_id = project_id
         self.graph_name = graph_name
+        # The schema description is static, so it is serialized once
+        self._schema_json: Optional[str] = None
+        # Opened on first use; every database handle brings its own session pool
+        self._database: Optional[Any] = None
+        self._database_factory = database_factory
 
         # Initialize Spanner client
         try:
-            self.client = spanner.Client(project=project_id)
+            if spanner_client is None:
+                from google.cloud import spanner
+
+                spanner_client = spanner.Client(project=project_id)
+            self.client = spanner_client
             self.instance = self.client.instance(instance_id)
-            self.database = self.instance.database(database_id)
             logger.info(
-                f"Initialized SpannerSchemaProvider for database '{database_id}' "
-                f"in instance '{instance_id}'"
+                "Initialized SpannerSchemaProvider for database '%s' in instance '%s'",
+                database_id,
+                instance_id,
             )
         except Exception as e:
-            logger.error(f"Failed to initialize Spanner client: {e}")
+            logger.error("Failed to initialize Spanner client: %s", e)
             raise
 
     def get_schema(self, query: str, agent_type: str = "default") -> str:
@@ -71,27 +129,16 @@ class SpannerSchemaProvider:
         Returns:
             JSON-formatted schema information for client GQL generation
         """
+        if self._schema_json is not None:
+            return self._schema_json
+
         try:
             schema_info = {
                 "graph_name": self.graph_name,
                 "vertex_tables": self._get_vertex_table_info(),
                 "edge_tables": self._get_edge_table_info(),
-                "entity_types": [
-                    "Company",
-                    "Person",
-                    "Location",
-                    "Organization",
-                    "Educational Institution",
-                ],
-                "relationship_types": [
-                    "WORKED_AT",
-                    "CITIZEN_OF",
-                    "EDUCATED_AT",
-                    "MEMBER_OF",
-                    "FOUNDER_OF",
-                    "SUBSIDIARY_OF",
-                    "EMPLOYED_BY",
-                ],
+                "entity_types": _ENTITY_TYPES,
+                "relationship_types": _RELATIONSHIP_TYPES,
                 "example_queries": {
                     "count_entities": "MATCH (n:entities {entity_type: 'Company'}) RETURN count(n) AS count",
                     "find_entity": "MATCH (n:entities {name: 'Google'}) RETURN n",
@@ -101,12 +148,55 @@ class SpannerSchemaProvider:
             }
 
             # Convert to formatted JSON string
-            return json.dumps(schema_info, indent=2)
+            self._schema_json = json.dumps(schema_info, indent=2)
+            return self._schema_json
 
         except Exception as e:
-            logger.error(f"Error retrieving schema from Spanner: {e}")
+            logger.error("Error retrieving schema from Spanner: %s", e)
             return json.dumps({"error": str(e)})
 
+    @property
+    def database(self) -> Any:
+        """The Spanner database handle, opened on first access."""
+        # The factory's owner caches the handle, and may reopen it
+        if self._database_factory is not None:
+            return self._database_factory()
+        if self._database is None:
+            self._database = self.instance.database(self.database_id)
+        return self._database
+
+    @property
+    def entity_types(self) -> Tuple[str, ...]:
+        """The entity types of the graph; use list() for a mutable copy."""
+        return _ENTITY_TYPES
+
+    @property
+    def relationship_types(self) -> Tuple[str, ...]:
+        """The relationship types of the graph; use list() for a mutable copy."""
+        return _RELATIONSHIP_TYPES
+
+    def is_entity_type(self, name: str) -> bool:
+        """Check whether name is an entity type of the graph."""
+        return name in _ENTITY_TYPE_SET
+
+    def is_relationship_type(self, name: str) -> bool:
+        """Check whether name is a relationship type of the graph."""
+        return name in _RELATIONSHIP_TYPE_SET
+
+    def detect_types(self, query: str) -> Set[str]:
+        """
+        Find the entity and relationship types mentioned in a query.
+
+        Matching is case-insensitive on whole words.
+
+        Args:
+            query: The natural language or GQL query to scan
+
+        Returns:
+            The canonical names of the types found in the query
+        """
+        return {_TYPE_BY_LOWER[m.group(0).lower()] for m in _TYPE_RE.finditer(query)}
+
     def _get_vertex_table_info(self) -> Dict[str, Any]:
         """Get information about vertex tables."""
         return {
@@ -1,19 +1,80 @@
 import logging
 import json
-from typing import List, Dict
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Iterator, List
 from google.cloud import bigquery
 from google.cloud import spanner
 import yaml
 from tqdm import tqdm
 
+# The BigQuery Storage API downloads results as Arrow record batches over
+# gRPC, several times faster than paging through the REST API
+try:
+    from google.cloud import bigquery_storage
+
+    BQSTORAGE_AVAILABLE = True
+except ImportError:
+    BQSTORAGE_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Compact encoder for JSON columns; orjson is several times faster than the
+# stdlib encoder, which is built once instead of per json.dumps call
+try:
+    import orjson
+
+    def _encode_json(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    _encode_json = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+# Simple mapping for entity types (expand as needed). Read-only, since every
+# loader shares it
+_ENTITY_TYPE_MAP = MappingProxyType(
+    {
+        "Q5": "Human",
+        "Q43229": "Organization",
+        "Q515": "City",
+        # Add more from Wikidata ontology
+    }
+)
+
+# Bound once; the transforms emit it for the created_at column of every row
+_COMMIT_TIMESTAMP = spanner.COMMIT_TIMESTAMP
+
+# Spanner columns written for each table, in the order the transforms emit
+_ENTITY_COLUMNS = (
+    "vid",
+    "entity_type",
+    "label",
+    "description",
+    "confidence_score",
+    "type_specific_attributes",
+    "raw_claims",
+    "created_at",
+)
+_EDGE_COLUMNS = (
+    "from_vid",
+    "to_vid",
+    "edge_type",
+    "start_date",
+    "end_date",
+    "role",
+    "rank",
+    "properties",
+    "created_at",
+)
+
 
 class UnifiedLoader:
     def __init__(self, config_path: str):
         with open(config_path, "r") as f:
-            self.config = yaml.safe_load(f)
+            self.config = yaml.safe_load(f.read())
 
         self.project_id = self.config["gcp"]["project_id"]
         self.spanner_instance = self.config["gcp"]["spanner"]["instance_id"]
@@ -22,25 +83,41 @@ class UnifiedLoader:
         self.bq_entities_view = self.config["gcp"]["bigquery"]["views"]["entities"]
         self.bq_edges_view = self.config["gcp"]["bigquery"]["views"]["edges"]
 
+        # Spanner batch commits are network-bound, so several run at once; the
+        # session pool is sized so every worker can hold a session
+        ingestion = self.config.get("pipeline", {}).get("ingestion", {})
+        self.max_workers = ingestion.get("max_workers", 4)
+        # Edges reference entities through foreign keys, so by default entities
+        # are loaded first; schemas without them can load both at once
+        self.parallel_phases = ingestion.get("parallel_phases", False)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="spanner-load"
+        )
+
         self.bq_client = bigquery.Client(project=self.project_id)
+        self.bqstorage_client = (
+            bigquery_storage.BigQueryReadClient() if BQSTORAGE_AVAILABLE else None
+        )
         self.spanner_client = spanner.Client(project=self.project_id)
         self.instance = self.spanner_client.instance(self.spanner_instance)
-        self.database = self.instance.database(self.spanner_db)
+        self.database = self.instance.database(
+            self.spanner_db,
+            pool=spanner.BurstyPool(target_size=max(10, self.max_workers)),
+        )
 
-        # Simple mapping for entity types (expand as needed)
-        self.entity_type_map = {
-            "Q5": "Human",
-            "Q43229": "Organization",
-            "Q515": "City",
-            # Add more from Wikidata ontology
-        }
+        # Shared by all loaders and read-only; use dict(...) for a copy that
+        # takes instance-specific types
+        self.entity_type_map = _ENTITY_TYPE_MAP
 
     def _get_entity_type(self, instance_of_id: str) -> str:
         return self.entity_type_map.get(instance_of_id, "Unknown")
 
     def _transform_entity(self, row: Dict) -> List:
         vid = row["id"]
-        entity_type = self._get_entity_type(row.get("primary_instance_of_id", ""))
+        # Inlined _get_entity_type; this runs once per ingested row
+        entity_type = self.entity_type_map.get(
+            row.get("primary_instance_of_id"), "Unknown"
+        )
         label = row.get("label")
         description = row.get("description")
         confidence_score = 1.0  # Default
@@ -52,7 +129,7 @@ class UnifiedLoader:
             try:
                 # Parse and re-serialize to ensure valid JSON format
                 parsed = json.loads(type_specific_json)
-                type_specific_json = json.dumps(parsed, ensure_ascii=False)
+                type_specific_json = _encode_json(parsed)
             except json.JSONDecodeError:
                 logger.warning(
                     f"Invalid JSON in type_specific_attributes for entity {vid}"
@@ -65,7 +142,7 @@ class UnifiedLoader:
         if raw_claims_json:
             try:
                 parsed = json.loads(raw_claims_json)
-                raw_claims_json = json.dumps(parsed, ensure_ascii=False)
+                raw_claims_json = _encode_json(parsed)
             except json.JSONDecodeError:
                 logger.warning(f"Invalid JSON in raw_claims for entity {vid}")
                 raw_claims_json = None
@@ -78,20 +155,20 @@ class UnifiedLoader:
             confidence_score,
             type_specific_json,
             raw_claims_json,
-            spanner.COMMIT_TIMESTAMP,
+            _COMMIT_TIMESTAMP,
         ]
 
     def _transform_edge(self, row: Dict) -> List:
         from_vid = row["from_id"]
         to_vid = row["to_id"]
-        edge_type = row.get("edge_label", "RELATED_TO").upper()
+        edge_type = row.get("edge_label") or "RELATED_TO"
         start_date = row.get("start_date")
         end_date = row.get("end_date")
         role = row.get("role")
         rank = row.get("rank")
-        properties_json = (
-            json.dumps(row.get("properties", {})) if "properties" in row else None
-        )
+        # Missing and empty properties are both stored as NULL
+        properties = row.get("properties")
+        properties_json = _encode_json(properties) if properties else None
 
         return [
             from_vid,
@@ -102,93 +179,120 @@ class UnifiedLoader:
             role,
             rank,
             properties_json,
-            spanner.COMMIT_TIMESTAMP,
+            _COMMIT_TIMESTAMP,
         ]
 
+    def _iter_batches(self, query: str, batch_size: int, desc: str) -> Iterator[List]:
+        """Stream query results from BigQuery in lists of batch_size rows.
+
+        Rows are fetched page by page, so only one batch is held in memory
+        and the first batch can be written while later pages download.
+        """
+        result = self.bq_client.query(query).result(page_size=batch_size)
+        # A RowIterator can only be started once, so iterating it here would
+        # make to_arrow_iterable() raise "Iterator has already started"
+        if self.bqstorage_client is not None:
+            # Arrow rows come back as dicts, which the transforms accept as-is
+            rows = (
+                row
+                for record_batch in result.to_arrow_iterable(
+                    bqstorage_client=self.bqstorage_client
+                )
+                for row in record_batch.to_pylist()
+            )
+        else:
+            rows = iter(result)
+
+        with tqdm(total=result.total_rows, desc=desc, unit="rows") as progress:
+            while batch := list(islice(rows, batch_size)):
+                yield batch
+                progress.update(len(batch))
+
+    @staticmethod
+    def _settle(future: Future, size: int) -> int:
+        try:
+            future.result()
+            return size
+        except Exception as e:
+            logger.error(f"Error inserting batch: {e}")
+            return 0
+
+    def _commit_batches(
+        self, batches: Iterable[List], flush: Callable[[List], None]
+    ) -> int:
+        """Commit batches on the worker pool and return the rows written.
+
+        At most twice max_workers batches are pending at a time, which bounds
+        memory while keeping every worker busy.
+        """
+        loaded = 0
+        in_flight = deque()
+        for batch in batches:
+            in_flight.append((self._executor.submit(flush, batch), len(batch)))
+            if len(in_flight) >= self.max_workers * 2:
+                loaded += self._settle(*in_flight.popleft())
+        while in_flight:
+            loaded += self._settle(*in_flight.popleft())
+        return loaded
+
+    def _flush_entities(self, batch: List) -> None:
+        values = list(map(self._transform_entity, batch))
+        with self.database.batch() as batch_tx:
+            batch_tx.insert_or_update(
+                "entities", columns=_ENTITY_COLUMNS, values=values
+            )
+
+    def _flush_edges(self, batch: List) -> None:
+        values = list(map(self._transform_edge, batch))
+        with self.database.batch() as batch_tx:
+            batch_tx.insert_or_update("edges", columns=_EDGE_COLUMNS, values=values)
+
     def load_entities(
         self, batch_size: int = 1000, dry_run: bool = False, limit: int = None
     ) -> int:
         query = f"SELECT * FROM `{self.project_id}.{self.bq_dataset}.{self.bq_entities_view}`"
         if limit:
             query += f" LIMIT {limit}"
-        job = self.bq_client.query(query)
-        rows = list(job.result())
 
-        loaded = 0
-        for i in tqdm(range(0, len(rows), batch_size), desc="Loading entities"):
-            batch = rows[i : i + batch_size]
-
-            if dry_run:
+        batches = self._iter_batches(query, batch_size, "Loading entities")
+        if dry_run:
+            for batch in batches:
                 logger.info(f"Dry run: Would insert {len(batch)} entities")
-            else:
-                try:
-                    with self.database.batch() as batch_tx:
-                        for row in batch:
-                            values = self._transform_entity(row)
-                            batch_tx.insert_or_update(
-                                "entities",
-                                columns=[
-                                    "vid",
-                                    "entity_type",
-                                    "label",
-                                    "description",
-                                    "confidence_score",
-                                    "type_specific_attributes",
-                                    "raw_claims",
-                                    "created_at",
-                                ],
-                                values=[values],
-                            )
-                    loaded += len(batch)
-                except Exception as e:
-                    logger.error(f"Error inserting batch: {e}")
+            return 0
 
-        return loaded
+        return self._commit_batches(batches, self._flush_entities)
 
     def load_edges(
         self, batch_size: int = 1000, dry_run: bool = False, limit: int = None
     ) -> int:
+        # Edge labels are upper-cased by BigQuery rather than per row in Python
         query = (
-            f"SELECT * FROM `{self.project_id}.{self.bq_dataset}.{self.bq_edges_view}`"
+            "SELECT * REPLACE (UPPER(edge_label) AS edge_label) "
+            f"FROM `{self.project_id}.{self.bq_dataset}.{self.bq_edges_view}`"
         )
         if limit:
             query += f" LIMIT {limit}"
-        job = self.bq_client.query(query)
-        rows = list(job.result())
-
-        loaded = 0
-        for i in tqdm(range(0, len(rows), batch_size), desc="Loading edges"):
-            batch = rows[i : i + batch_size]
 
-            if dry_run:
+        batches = self._iter_batches(query, batch_size, "Loading edges")
+        if dry_run:
+            for batch in batches:
                 logger.info(f"Dry run: Would insert {len(batch)} edges")
-            else:
-                try:
-                    with self.database.batch() as batch_tx:
-                        for row in batch:
-                            values = self._transform_edge(row)
-                            batch_tx.insert_or_update(
-                                "edges",
-                                columns=[
-                                    "from_vid",
-                                    "to_vid",
-                                    "edge_type",
-                                    "start_date",
-                                    "end_date",
-                                    "role",
-                                    "rank",
-                                    "properties",
-                                    "created_at",
-                                ],
-                                values=[values],
-                            )
-                    loaded += len(batch)
-                except Exception as e:
-                    logger.error(f"Error inserting batch: {e}")
+            return 0
 
-        return loaded
+        return self._commit_batches(batches, self._flush_edges)
 
     def run(self, dry_run: bool = False, limit: int = None):
+        if self.parallel_phases:
+            logger.info("Starting entity and edge loads")
+            with ThreadPoolExecutor(max_workers=2) as phases:
+                entities = phases.submit(
+                    self.load_entities, dry_run=dry_run, limit=limit
+                )
+                edges = phases.submit(self.load_edges, dry_run=dry_run, limit=limit)
+                logger.info(f"Loaded {entities.result()} entities")
+                logger.info(f"Loaded {edges.result()} edges")
+            return
+
         logger.info("Starting entity load")
         entities_loaded = self.load_entities(dry_run=dry_run, limit=limit)
         logger.info(f"Loaded {entities_loaded} entities")
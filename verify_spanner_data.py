@@ -5,21 +5,21 @@ client = spanner.Client(project="imperial-ally-429713-v1")
 instance = client.instance("wikidata-graph-instance")
 database = instance.database("wikidata-graph-db")
 
-# Count entities
-with database.snapshot() as snapshot:
+# One multi-use snapshot serves every check: a single session and read
+# timestamp, so the counts and samples are consistent with each other
+with database.snapshot(multi_use=True) as snapshot:
+    # Count entities
     result = snapshot.execute_sql("SELECT COUNT(*) as count FROM entities")
     for row in result:
         print(f"Total entities loaded: {row[0]:,}")
 
-# Count edges
-with database.snapshot() as snapshot:
+    # Count edges
     result = snapshot.execute_sql("SELECT COUNT(*) as count FROM edges")
     for row in result:
         print(f"Total edges loaded: {row[0]:,}")
 
-# Sample entities
-print("\nSample entities:")
-with database.snapshot() as snapshot:
+    # Sample entities
+    print("\nSample entities:")
     result = snapshot.execute_sql(
         """
         SELECT vid, entity_type, label 
@@ -30,9 +30,8 @@ with database.snapshot() as snapshot:
     for row in result:
         print(f"  {row[0]}: {row[1]} - {row[2]}")
 
-# Sample edges
-print("\nSample edges:")
-with database.snapshot() as snapshot:
+    # Sample edges
+    print("\nSample edges:")
     result = snapshot.execute_sql(
         """
         SELECT from_vid, to_vid, edge_type 
@@ -43,15 +42,14 @@ with database.snapshot() as snapshot:
     for row in result:
         print(f"  {row[0]} -> {row[1]} ({row[2]})")
 
-# Check connectivity
-print("\nChecking connectivity:")
-with database.snapshot() as snapshot:
+    # Check connectivity. The foreign keys on edges.from_vid and edges.to_vid
+    # (see docs/spanner_schema_ddl.sql) guarantee both endpoints exist, so no
+    # join back to entities is needed; from_vid leads the primary key
+    print("\nChecking connectivity:")
     result = snapshot.execute_sql(
         """
-        SELECT COUNT(DISTINCT e.from_vid) as connected_entities
-        FROM edges e
-        JOIN entities ent1 ON e.from_vid = ent1.vid
-        JOIN entities ent2 ON e.to_vid = ent2.vid
+        SELECT COUNT(DISTINCT from_vid) as connected_entities
+        FROM edges
     """
     )
     for row in result: